@@ -5,19 +5,50 @@ Modern web UI for streaming and playing Shoutcast streams on Momento
 """
 
 from flask import Flask, render_template, jsonify, request, session, redirect, url_for
-from functools import wraps
+from functools import wraps, lru_cache
 import subprocess
 import os
 import json
 import threading
 import time
+import signal
 import struct
+import select
+import fcntl
+import socket
+import selectors
 import array
+import atexit
 import shutil
+import traceback
+import urllib.request
+import xml.etree.ElementTree as ET
+import pwd
+import grp
 from pathlib import Path
 import hashlib
+import hmac
 import re
 import math
+import operator
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; fall back to pure-Python RMS
+    np = None
+try:
+    import av  # PyAV (libav); optional in-process decoder
+except ImportError:
+    av = None
+try:
+    import alsaaudio  # pyalsaaudio; optional in-process ALSA output
+except ImportError:
+    alsaaudio = None
+try:
+    import orjson  # optional faster JSON serialiser for status.json and polled APIs
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'shoutcast-web-ui-secret-key-change-in-production'
@@ -29,15 +60,48 @@ ADMIN_USERNAME = 'admin'
 # Password is stored in password.txt file, default is 'admin123'
 PASSWORD_FILE = Path(__file__).parent / 'password.txt'
 
+# scrypt cost (n=2**14, r=8 -> 16 MiB, ~0.1 s on a Pi); stored with the salt as
+# "scrypt$n$r$p$salt_hex$hash_hex". A bare hex SHA-256 (older password.txt) is still
+# accepted and upgraded to scrypt on the next successful login.
+_SCRYPT_N, _SCRYPT_R, _SCRYPT_P = 2 ** 14, 8, 1
+_HAS_SCRYPT = hasattr(hashlib, 'scrypt')  # needs Python built against OpenSSL 1.1+
+
+def _hash_password(password: str) -> str:
+    """Return the password.txt encoding of password (salted scrypt when available)"""
+    if not _HAS_SCRYPT:
+        return hashlib.sha256(password.encode()).hexdigest()
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P,
+                            maxmem=64 * 1024 * 1024, dklen=32)
+    return f'scrypt${_SCRYPT_N}${_SCRYPT_R}${_SCRYPT_P}${salt.hex()}${digest.hex()}'
+
+def _is_legacy_hash(stored: str) -> bool:
+    """True for an unsalted hex SHA-256 hash from before scrypt"""
+    return not stored.startswith('scrypt$')
+
+def _verify_password(password: str, stored: str) -> bool:
+    """Constant-time check of password against a password.txt hash (scrypt or legacy SHA-256)"""
+    try:
+        if _is_legacy_hash(stored):
+            return hmac.compare_digest(hashlib.sha256(password.encode()).digest(), bytes.fromhex(stored))
+        _, n, r, p, salt_hex, hash_hex = stored.split('$')
+        expected = bytes.fromhex(hash_hex)
+        digest = hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt_hex), n=int(n), r=int(r),
+                                p=int(p), maxmem=64 * 1024 * 1024, dklen=len(expected))
+        return hmac.compare_digest(digest, expected)
+    except (ValueError, AttributeError):
+        return False  # Corrupt file, or a scrypt hash on a Python without scrypt
+
+@lru_cache(maxsize=1)
 def load_password_hash():
-    """Load password hash from file, or create default"""
+    """Load password hash from file, or create default (read once; cleared on password change)"""
     try:
         if PASSWORD_FILE.exists():
             with open(PASSWORD_FILE, 'r') as f:
                 return f.read().strip()
         else:
             # Create default password file
-            default_hash = hashlib.sha256('admin123'.encode()).hexdigest()
+            default_hash = _hash_password('admin123')
             with open(PASSWORD_FILE, 'w') as f:
                 f.write(default_hash)
             return default_hash
@@ -45,6 +109,13 @@ def load_password_hash():
         # Fallback to default
         return hashlib.sha256('admin123'.encode()).hexdigest()
 
+def _store_password_hash(new_hash: str):
+    """Persist a new password hash and refresh the cached copy"""
+    global ADMIN_PASSWORD_HASH
+    _atomic_write(PASSWORD_FILE, new_hash.encode())
+    load_password_hash.cache_clear()
+    ADMIN_PASSWORD_HASH = new_hash
+
 ADMIN_PASSWORD_HASH = load_password_hash()
 
 # Configuration file path
@@ -59,92 +130,294 @@ decoder_process = None
 decoder_aplay_process = None  # aplay process when using mpg123 stdout method
 decoder_supervisor_thread = None
 decoder_should_run = False
+# Set on decoder stop so the supervisor's backoff/idle waits end at once instead of sleeping out
+_decoder_wake = threading.Event()
 audio_level_thread = None
-audio_levels = {'left': 0.0, 'right': 0.0}
+audio_meter_process = None  # persistent arecord feeding the input meter
+# Set to stop the meter thread; its retry waits return immediately instead of sleeping out
+_meter_stop = threading.Event()
+# (left, right) published as one immutable tuple, so readers never see a torn update
+audio_levels = (0.0, 0.0)
+decoder_current_volume = 100
 # Removed: decoder_audio_level_thread and decoder_audio_levels (meter removed)
 running = True
 
+# PCM format shared by every decoder pipeline (CD quality: 44.1 kHz, stereo, 16-bit)
+SAMPLE_RATE = 44100
+CHANNELS = 2
+BYTES_PER_SAMPLE = 2
+PCM_BYTES_PER_SEC = SAMPLE_RATE * CHANNELS * BYTES_PER_SAMPLE  # 176400
+# ALSA period (~23 ms at 44.1 kHz); aplay's ring is at least 4 periods
+ALSA_PERIOD_FRAMES = 1024
+ALSA_MIN_BUFFER_FRAMES = ALSA_PERIOD_FRAMES * 4
+ALSA_MAX_BUFFER_FRAMES = 131072  # ~3 seconds at 44.1 kHz
+_APLAY_PCM_ARGS = ('-f', 'cd', '-c', str(CHANNELS), '-r', str(SAMPLE_RATE))
+_APLAY_MIN_RING_ARGS = ('-B', str(ALSA_MIN_BUFFER_FRAMES), '-F', str(ALSA_PERIOD_FRAMES))
+# Kernel pipe between decoder and aplay: ~1.5 s of PCM instead of the default 64 KB
+_PCM_PIPE_BYTES = 262144
+_F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+
+def _size_pcm_pipe(pipe):
+    """Grow a PCM pipe to _PCM_PIPE_BYTES (best effort; capped by fs.pipe-max-size)."""
+    try:
+        fcntl.fcntl(pipe.fileno(), _F_SETPIPE_SZ, _PCM_PIPE_BYTES)
+    except (OSError, ValueError, AttributeError):
+        pass
+
+def _alsa_buffer_frames(buffer_secs) -> int:
+    """aplay ring size: buffer_secs worth of frames, at least 4 periods, capped at ~3 s."""
+    return min(max(ALSA_MIN_BUFFER_FRAMES, int(buffer_secs * SAMPLE_RATE)), ALSA_MAX_BUFFER_FRAMES)
+
+# Tool paths resolved once at import instead of walking PATH on every call
+AMIXER_PATH = shutil.which('amixer') or '/usr/bin/amixer'
+APLAY_PATH = shutil.which('aplay') or '/usr/bin/aplay'
+ARECORD_PATH = shutil.which('arecord') or '/usr/bin/arecord'
+CVLC_PATH = shutil.which('cvlc') or '/usr/bin/cvlc'
+DARKICE_PATH = shutil.which('darkice') or '/usr/bin/darkice'
+FFMPEG_PATH = shutil.which('ffmpeg') or '/usr/bin/ffmpeg'
+FUSER_PATH = shutil.which('fuser') or '/usr/bin/fuser'
+ICECAST2_PATH = shutil.which('icecast2') or '/usr/bin/icecast2'
+IP_PATH = shutil.which('ip') or '/usr/bin/ip'
+MPG123_PATH = shutil.which('mpg123') or '/usr/bin/mpg123'
+PKILL_PATH = shutil.which('pkill') or '/usr/bin/pkill'
+SUDO_PATH = shutil.which('sudo') or '/usr/bin/sudo'
+SYSTEMCTL_PATH = shutil.which('systemctl') or '/usr/bin/systemctl'
+_BIN_NAMES = ('amixer', 'aplay', 'arecord', 'cvlc', 'darkice', 'ffmpeg', 'fuser',
+              'icecast2', 'ip', 'mpg123', 'pkill', 'sudo', 'systemctl')
+
+def refresh_binpaths():
+    """Re-resolve every *_PATH constant, e.g. after a tool was installed while the app is running."""
+    paths = globals()
+    for name in _BIN_NAMES:
+        paths[f'{name.upper()}_PATH'] = shutil.which(name) or f'/usr/bin/{name}'
+    _build_stop_argvs()
+
+def _build_stop_argvs():
+    """Freeze the fixed stop command lines once per path resolution instead of per request."""
+    global _SYSTEMCTL_STOP_ICECAST, _ICECAST_STOP_ROUNDS
+    _SYSTEMCTL_STOP_ICECAST = (SYSTEMCTL_PATH, 'stop', 'icecast2')
+    # (signal, fallback argvs, grace, message) per round: TERM first, SIGKILL only if it stays up
+    _ICECAST_STOP_ROUNDS = tuple(
+        (sig, ((SUDO_PATH, '-n', PKILL_PATH, *signal_args, '-x', 'icecast2'),
+               (PKILL_PATH, *signal_args, '-x', 'icecast2')), grace, message)
+        for sig, signal_args, grace, message in (
+            (signal.SIGTERM, (), 2.0, 'Icecast server stopped successfully'),
+            (signal.SIGKILL, ('-9',), 1.0, 'Icecast server stopped successfully (force kill)')))
+
+_build_stop_argvs()
+
+def _stereo_rms(data) -> tuple:
+    """Return (left_rms, right_rms) for interleaved S16_LE stereo PCM."""
+    if np is not None:
+        # Whole frames only: a trailing partial frame would shift the channels
+        samples = np.frombuffer(data, dtype='<i2', count=(len(data) // 4) * 2)
+        if samples.size < 2:
+            return 0.0, 0.0
+        # astype() widens each strided channel view into its own int64 copy (so 32767**2 * n
+        # can't overflow); dot() then sums the squares in one pass without a squared temporary
+        left = samples[0::2].astype(np.int64)
+        right = samples[1::2].astype(np.int64)
+        frames = left.size
+        return math.sqrt(int(left.dot(left)) / frames), math.sqrt(int(right.dot(right)) / frames)
+    samples = array.array('h')
+    samples.frombytes(data[:len(data) & ~3])
+    if len(samples) < 2:
+        return 0.0, 0.0
+    left = samples[0::2]
+    right = samples[1::2]
+    # map(mul) keeps the multiply-accumulate in C; no abs() needed since RMS squares anyway
+    left_rms = (sum(map(operator.mul, left, left)) / len(left)) ** 0.5
+    right_rms = (sum(map(operator.mul, right, right)) / len(right)) ** 0.5
+    return left_rms, right_rms
+
+_PROC_SCAN_TTL = 0.5  # seconds; back-to-back status calls share one /proc walk
+_proc_scan_cache = (0.0, {})
+_STATUS_TTL = 0.75  # seconds; /api/status polls from several tabs share one probe
+
+def _ttl_cache(ttl, miss_ttl=None, is_miss=None):
+    """
+    Memoize a no-argument status probe for `ttl` seconds.
+    Call it with fresh=True (start/stop endpoints verifying their own action) to rescan /proc now.
+    Results for which is_miss(value) holds are only kept for miss_ttl (retry soon, not storm).
+    """
+    def deco(fn):
+        state = (0.0, None)  # (expires at, value)
+
+        @wraps(fn)
+        def wrapped(fresh=False):
+            nonlocal state
+            global _proc_scan_cache
+            now = time.monotonic()
+            if fresh:
+                _proc_scan_cache = (0.0, {})
+            elif now < state[0]:
+                return state[1]
+            value = fn()
+            keep = miss_ttl if is_miss is not None and is_miss(value) else ttl
+            state = (now + keep, value)
+            return value
+
+        def cache_clear():
+            nonlocal state
+            state = (0.0, None)
+
+        wrapped.cache_clear = cache_clear
+        return wrapped
+    return deco
+
+def _scan_procs() -> dict:
+    """Walk /proc once and return {comm: [(pid, state), ...]} for every process."""
+    global _proc_scan_cache
+    now = time.monotonic()
+    stamp, procs = _proc_scan_cache
+    if now - stamp < _PROC_SCAN_TTL:
+        return procs
+    procs = {}
+    try:
+        with os.scandir('/proc') as it:
+            for entry in it:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    with open(f'/proc/{entry.name}/stat', 'r') as f:
+                        stat = f.read()
+                except OSError:
+                    continue  # Process exited during the scan
+                # Format: "pid (comm) state ..." - comm may itself contain ')'
+                head, _, tail = stat.rpartition(')')
+                comm = head.partition('(')[2]
+                state = tail.split(None, 1)[0] if tail.strip() else ''
+                procs.setdefault(comm, []).append((entry.name, state))
+    except OSError:
+        pass
+    _proc_scan_cache = (now, procs)
+    return procs
+
+def _find_procs(names: set) -> dict:
+    """Return {name: [(pid, state), ...]} for running processes whose comm is in names."""
+    procs = _scan_procs()
+    return {name: procs[name] for name in names if name in procs}
+
+@_ttl_cache(_STATUS_TTL)
 def get_encoder_status():
     """Check if encoder is running"""
     try:
-        result = subprocess.run(['pgrep', '-x', 'darkice'], 
-                              capture_output=True, text=True)
-        return result.returncode == 0
-    except:
+        # An exited-but-unreaped child (zombie) is not a running encoder
+        return any(state != 'Z' for _, state in _find_procs({'darkice'}).get('darkice', ()))
+    except Exception:
         return False
 
+@_ttl_cache(_STATUS_TTL)
 def get_decoder_status():
     """Check if decoder is running or intended to run (supervised)."""
     # If supervised to run, treat as active
     if decoder_should_run:
         return True
+    if decoder_engine.running():
+        return True
     try:
         # First check tracked processes - both must be running for valid status
-        if decoder_process and decoder_process.poll() is None:
-            # If we have aplay_process, it must also be running
+        if decoder_process:
+            if decoder_process.poll() is not None:
+                return False
+            # If we have aplay_process, it must also be running (cvlc mode has none)
             if decoder_aplay_process:
-                if decoder_aplay_process.poll() is None:
-                    return True
-                else:
-                    # aplay died, decoder not working
-                    return False
-            else:
-                # No aplay process (cvlc mode), just check main process
-                return True
+                return decoder_aplay_process.poll() is None
+            return True
+        if decoder_aplay_process:
+            return False
         
-        # Fallback: check system processes
-        pgrep_path = shutil.which('pgrep') or '/usr/bin/pgrep'
+        # Fallback: check system processes with a single /proc scan
+        found = _find_procs({'ffmpeg', 'aplay', 'mpg123', 'cvlc'})
         
-        # For ffmpeg pipeline: need both ffmpeg AND aplay
-        ffmpeg_result = subprocess.run([pgrep_path, '-x', 'ffmpeg'], capture_output=True, text=True)
-        aplay_result = subprocess.run([pgrep_path, '-x', 'aplay'], capture_output=True, text=True)
-        if ffmpeg_result.returncode == 0 and aplay_result.returncode == 0:
-            # Both running - check they're not zombies
-            ffmpeg_pids = ffmpeg_result.stdout.strip().split()
-            aplay_pids = aplay_result.stdout.strip().split()
-            if ffmpeg_pids and aplay_pids:
-                # Check if processes are actually running (not zombies)
-                ps_result = subprocess.run(['ps', '-p', ','.join(ffmpeg_pids + aplay_pids), '-o', 'stat='], 
-                                          capture_output=True, text=True)
-                if ps_result.returncode == 0:
-                    stats = ps_result.stdout.strip().split()
-                    # If any process is zombie (Z) or dead, return False
-                    if any('Z' in stat or 'D' in stat for stat in stats):
-                        return False
-                    # All processes are running (R, S, etc.)
-                    return True
+        def _all_alive(*names):
+            # If any process is zombie (Z) or in uninterruptible sleep (D), the pipeline is not alive
+            return all(state not in ('Z', 'D') for name in names for _, state in found[name])
         
+        # For ffmpeg pipeline: need both ffmpeg AND aplay
+        if found.get('ffmpeg') and found.get('aplay'):
+            return _all_alive('ffmpeg', 'aplay')
         # Check mpg123/aplay pipeline
-        mpg123_result = subprocess.run([pgrep_path, '-x', 'mpg123'], capture_output=True, text=True)
-        if mpg123_result.returncode == 0 and aplay_result.returncode == 0:
-            mpg123_pids = mpg123_result.stdout.strip().split()
-            aplay_pids = aplay_result.stdout.strip().split()
-            if mpg123_pids and aplay_pids:
-                ps_result = subprocess.run(['ps', '-p', ','.join(mpg123_pids + aplay_pids), '-o', 'stat='], 
-                                          capture_output=True, text=True)
-                if ps_result.returncode == 0:
-                    stats = ps_result.stdout.strip().split()
-                    if any('Z' in stat or 'D' in stat for stat in stats):
-                        return False
-                    return True
-        
+        if found.get('mpg123') and found.get('aplay'):
+            return _all_alive('mpg123', 'aplay')
         # Check cvlc (standalone, no aplay needed)
-        cvlc_result = subprocess.run([pgrep_path, '-x', 'cvlc'], capture_output=True, text=True)
-        if cvlc_result.returncode == 0:
-            cvlc_pids = cvlc_result.stdout.strip().split()
-            if cvlc_pids:
-                ps_result = subprocess.run(['ps', '-p', ','.join(cvlc_pids), '-o', 'stat='], 
-                                          capture_output=True, text=True)
-                if ps_result.returncode == 0:
-                    stats = ps_result.stdout.strip().split()
-                    if any('Z' in stat or 'D' in stat for stat in stats):
-                        return False
-                    return True
+        if found.get('cvlc'):
+            return _all_alive('cvlc')
         
         return False
     except Exception:
         return False
 
+_APLAY_CARD_RE = re.compile(rb'^card\s+(\d+):\s*(.*)$', re.IGNORECASE | re.MULTILINE)
+_URL_SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*://')
+# Decoder error classification: one case-insensitive pass over the message per class
+_CONN_ERR_RE = re.compile(r'connection|resolve|network|timeout|refused', re.IGNORECASE)
+_DEVICE_ERR_RE = re.compile(r'driver|out123|alsa|device|no such file', re.IGNORECASE)
+
+def normalize_url(u: str) -> str:
+    """Strip a stream URL and default it to http:// when no scheme is given."""
+    u = (u or '').strip()
+    if not u:
+        return u
+    if not _URL_SCHEME_RE.match(u):
+        return f'http://{u}'
+    return u
+
+_MP3_URL_RE = re.compile(r'\.mp3|mp3stream', re.IGNORECASE)
+
+@lru_cache(maxsize=64)
+def _is_mp3_like(url: str) -> bool:
+    """Heuristic: does the stream URL look like MP3? (cached; the supervisor retries the same URL)"""
+    return bool(_MP3_URL_RE.search(url))
+
+# One reactor thread drains every child's log pipes (epoll wait) instead of a thread per pipe
+_drain_selector = selectors.DefaultSelector()
+_drain_lock = threading.Lock()
+_drain_thread = None
+
+def _drain_loop():
+    """Discard output from every registered pipe; exits once nothing is left to watch."""
+    global _drain_thread
+    while True:
+        with _drain_lock:
+            if not _drain_selector.get_map():
+                _drain_thread = None
+                return
+        for key, _ in _drain_selector.select(timeout=1.0):
+            try:
+                data = os.read(key.fd, 65536)
+            except BlockingIOError:
+                continue
+            except OSError:
+                data = b''
+            if not data:
+                # Child closed the pipe (exited); stop watching it
+                with _drain_lock:
+                    try:
+                        _drain_selector.unregister(key.fileobj)
+                    except (KeyError, ValueError):
+                        pass
+
+def _drain_pipe(pipe):
+    """Hand a child's output pipe to the drain reactor so a long-running process never blocks on it."""
+    global _drain_thread
+    if pipe is None:
+        return
+    try:
+        with _drain_lock:
+            os.set_blocking(pipe.fileno(), False)
+            _drain_selector.register(pipe, selectors.EVENT_READ)
+            if _drain_thread is None:
+                _drain_thread = threading.Thread(target=_drain_loop, daemon=True)
+                _drain_thread.start()
+    except (KeyError, ValueError, OSError):
+        pass
+
+# mpg123's environment, built once: no JACK server hints, and the Pi's (aarch64) output modules
+_MPG123_ENV = {k: v for k, v in os.environ.items()
+               if k not in ('JACK_PROMISCUOUS_SERVER', 'JACK_DEFAULT_SERVER')}
+_MPG123_ENV['MPG123_MODDIR'] = '/usr/lib/aarch64-linux-gnu/mpg123'
+
 def _start_decoder_process(stream_url: str, output_device: str, volume: int = 100, buffer_secs: int = 5, playback_cache_secs: int = 2):
     """Start decoder process (mpg123 or cvlc) with volume control"""
     global decoder_current_volume
@@ -153,79 +426,46 @@ def _start_decoder_process(stream_url: str, output_device: str, volume: int = 10
     global decoder_process, decoder_aplay_process
     decoder_process = None
     decoder_aplay_process = None
-    mpg123_path = shutil.which('mpg123') or '/usr/bin/mpg123'
-    aplay_path = shutil.which('aplay') or '/usr/bin/aplay'
-    env = os.environ.copy()
-    env.pop('JACK_PROMISCUOUS_SERVER', None)
-    env.pop('JACK_DEFAULT_SERVER', None)
-    env['MPG123_MODDIR'] = '/usr/lib/aarch64-linux-gnu/mpg123'
-    
+    mpg123_path = MPG123_PATH
+    aplay_path = APLAY_PATH
     # Get volume (0-100) and convert to gain factor (0.0-1.0)
     volume_factor = volume / 100.0
 
     # Heuristic: try mpg123 only for MP3-like URLs
-    is_mp3_like = any(ext in stream_url.lower() for ext in ['.mp3', 'mp3stream'])
-    if is_mp3_like:
+    if _is_mp3_like(stream_url):
         try:
             # mpg123 buffer: convert seconds to bytes (stereo 16-bit PCM)
-            # buffer_secs * 44100 * 2 * 2 = buffer_secs * 176400 bytes
-            mpg123_buffer_bytes = buffer_secs * 44100 * 2 * 2
+            mpg123_buffer_bytes = buffer_secs * PCM_BYTES_PER_SEC
             mpg123_buffer_bytes = max(4096, min(1048576, mpg123_buffer_bytes))  # Clamp between 4KB and 1MB
             # mpg123 with user-configurable buffering (helps with network issues)
             # Larger buffer reduces audio cuts during network hiccups
+            mpg123_cmd = [mpg123_path, '-q', '-s', '-b', str(mpg123_buffer_bytes)]
+            if volume_factor < 1.0:
+                # Scale inside the decoder (-f, default 32768) instead of piping through sox
+                mpg123_cmd += ['-f', str(int(32768 * volume_factor))]
             mpg123_proc = subprocess.Popen(
-                [mpg123_path, '-q', '-s', '-b', str(mpg123_buffer_bytes), stream_url],
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL, env=env
+                mpg123_cmd + [stream_url],
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL, env=_MPG123_ENV,
+                bufsize=0, start_new_session=True
             )
-            # Use sox to apply volume if available, otherwise pipe directly
-            sox_path = shutil.which('sox') or '/usr/bin/sox'
-            if os.path.exists(sox_path) and volume_factor < 1.0:
-                # Apply volume using sox
-                sox_gain = volume_factor
-                sox_proc = subprocess.Popen(
-                    [sox_path, '-t', 'raw', '-r', '44100', '-c', '2', '-b', '16', '-e', 'signed-integer', '-',
-                     '-t', 'raw', '-r', '44100', '-c', '2', '-b', '16', '-e', 'signed-integer', '-', 'gain', str(sox_gain)],
-                    stdin=mpg123_proc.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                mpg123_proc.stdout.close()
-                # ALSA buffer configuration for smooth playback
-                period_frames = 1024
-                buffer_frames = period_frames * 4
-                aplay_proc = subprocess.Popen(
-                    [aplay_path, '-D', output_device, '-f', 'cd', '-c', '2', '-r', '44100',
-                     '-B', str(buffer_frames), '-F', str(period_frames)],
-                    stdin=sox_proc.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                sox_proc.stdout.close()
-                decoder_process = mpg123_proc
-                decoder_aplay_process = aplay_proc
-            else:
-                # Direct pipe without volume control (or volume is 100%)
-                # ALSA buffer configuration for smooth playback
-                period_frames = 1024
-                buffer_frames = period_frames * 4
-                aplay_proc = subprocess.Popen(
-                    [aplay_path, '-D', output_device, '-f', 'cd', '-c', '2', '-r', '44100',
-                     '-B', str(buffer_frames), '-F', str(period_frames)],
-                    stdin=mpg123_proc.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
-                mpg123_proc.stdout.close()
-                decoder_process = mpg123_proc
-                decoder_aplay_process = aplay_proc
-            time.sleep(1.5)  # Increased wait time for network streams
+            _size_pcm_pipe(mpg123_proc.stdout)
+            # mpg123 stdout is handed straight to aplay, so PCM flows pipe-to-pipe in the kernel
+            # (minimum 4-period ALSA ring for smooth playback)
+            aplay_proc = subprocess.Popen(
+                [aplay_path, '-D', output_device, *_APLAY_PCM_ARGS, *_APLAY_MIN_RING_ARGS],
+                stdin=mpg123_proc.stdout, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            mpg123_proc.stdout.close()
+            if not _track_decoder(mpg123_proc, aplay_proc):
+                return False
+            # Validation window for network streams; returns early if either child dies
+            _wait_pids_exit((mpg123_proc.pid, aplay_proc.pid), 1.5, first=True)
             if decoder_process and decoder_process.poll() is None and decoder_aplay_process and decoder_aplay_process.poll() is None:
+                _drain_pipe(mpg123_proc.stderr)
                 return True
             # Clean up failed
-            try:
-                if decoder_process and decoder_process.poll() is None: 
-                    decoder_process.terminate()
-                    decoder_process.wait(timeout=1)
-            except: pass
-            try:
-                if decoder_aplay_process and decoder_aplay_process.poll() is None: 
-                    decoder_aplay_process.terminate()
-                    decoder_aplay_process.wait(timeout=1)
-            except: pass
+            _kill_pipeline(decoder_process, decoder_aplay_process)
         except Exception as e:
             print(f"mpg123 start exception: {e}")
             pass
@@ -234,127 +474,528 @@ def _start_decoder_process(stream_url: str, output_device: str, volume: int = 10
     # This fallback is no longer needed - use the optimized VLC function instead
     return False
 
+_PIDFD_OPEN = getattr(os, 'pidfd_open', None)  # Linux 5.3+ / Python 3.9+
+
+def _pid_gone(pid) -> bool:
+    """True once pid has exited (a zombie awaiting reaping counts as exited)."""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            return f.read().rpartition(')')[2].split(None, 1)[0] in ('Z', 'X')
+    except (OSError, IndexError):
+        return True
+
+def _wait_pids_exit(pids, timeout: float, first: bool = False) -> bool:
+    """
+    Block until every pid (or, with first=True, any pid) has exited, for at most `timeout` seconds.
+    Returns True if that happened. Waits on pidfds with poll() so exits wake us immediately;
+    falls back to checking /proc every 50 ms where pidfd_open is unavailable.
+    """
+    pids = [int(pid) for pid in pids]
+    if not pids:
+        return True
+    deadline = time.monotonic() + timeout
+    fds = []
+    try:
+        if _PIDFD_OPEN is not None:
+            try:
+                for pid in pids:
+                    try:
+                        fds.append(_PIDFD_OPEN(pid))
+                    except ProcessLookupError:
+                        if first:
+                            return True
+            except OSError:
+                for fd in fds:
+                    os.close(fd)
+                fds = None  # e.g. seccomp/old kernel: use the /proc fallback
+            if fds is not None:
+                if not fds:
+                    return True
+                poller = select.poll()
+                for fd in fds:
+                    poller.register(fd, select.POLLIN)
+                remaining = len(fds)
+                while remaining:
+                    wait_ms = int(max(0.0, deadline - time.monotonic()) * 1000)
+                    events = poller.poll(wait_ms)
+                    if not events:
+                        return False
+                    if first:
+                        return True
+                    for fd, _ in events:
+                        poller.unregister(fd)
+                        remaining -= 1
+                return True
+        while True:
+            gone = [_pid_gone(pid) for pid in pids]
+            if any(gone) if first else all(gone):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+    finally:
+        for fd in fds or ():
+            os.close(fd)
+
+_HAS_POSIX_SPAWN = hasattr(os, 'posix_spawn')
+_QUIET_FILE_ACTIONS = (
+    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+    (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+) if _HAS_POSIX_SPAWN else ()
+
+def _run_quiet(*argvs, timeout: float = 2.0):
+    """
+    Run small helper commands (pkill & co.) one after another with output discarded.
+    Uses posix_spawn (vfork+exec in glibc) so the app's page tables are never copied; a command
+    still running after `timeout` is SIGKILLed. Sequential on purpose: a `pkill -f vlc` must not
+    see a sibling `pkill -x vlc` in the process table.
+    """
+    for argv in argvs:
+        if not _HAS_POSIX_SPAWN:
+            try:
+                subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               check=False, timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            continue
+        try:
+            pid = os.posix_spawn(argv[0], list(argv), os.environ, file_actions=_QUIET_FILE_ACTIONS)
+        except OSError:
+            continue  # Tool not installed
+        try:
+            if not _wait_pids_exit((pid,), timeout):
+                os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        except (ChildProcessError, ProcessLookupError):
+            pass
+
+def _kill_pipeline(*procs, grace: float = 0.3):
+    """
+    Stop decoder children by process group (each is started with start_new_session=True):
+    SIGTERM every group at once, then SIGKILL whatever is still alive after `grace` seconds.
+    """
+    procs = [p for p in procs if p is not None and p.poll() is None]
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        for proc in procs:
+            try:
+                os.killpg(proc.pid, sig)  # pgid == pid for a session leader
+            except ProcessLookupError:
+                pass
+            except OSError:
+                try:
+                    proc.send_signal(sig)
+                except Exception:
+                    pass
+        deadline = time.monotonic() + grace
+        for proc in procs:
+            try:
+                proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                pass
+        procs = [p for p in procs if p.poll() is None]
+        if not procs:
+            break
+
+_DECODER_COMMS = ('mpg123', 'aplay', 'cvlc', 'vlc', 'ffmpeg')
+
+def _stop_decoder_pipeline(grace: float = 0.3):
+    """
+    Stop the decoder. Children we started are killed by process group and waited on; players
+    we don't own (e.g. left over from a previous app run) are found in /proc and signalled directly.
+    """
+    global decoder_process, decoder_aplay_process, _proc_scan_cache
+    decoder_engine.stop()
+    owned = {str(p.pid) for p in (decoder_process, decoder_aplay_process) if p is not None}
+    _kill_pipeline(decoder_process, decoder_aplay_process, grace=grace)
+    decoder_process = None
+    decoder_aplay_process = None
+
+    _proc_scan_cache = (0.0, {})
+    strays = [pid for procs in _find_procs(set(_DECODER_COMMS)).values()
+              for pid, state in procs if pid not in owned and state != 'Z']
+    # The scan already has the pids, so kill them here rather than fork a pkill to rescan /proc
+    for sig, wait in ((signal.SIGTERM, 2.0), (signal.SIGKILL, 0.5)):
+        strays = [pid for pid in strays if _signal_pid(pid, sig)]
+        if not strays or _wait_pids_exit(strays, wait):
+            break
+
+def _signal_pid(pid, sig) -> bool:
+    """Send sig to pid; False if it is already gone or not ours to signal."""
+    try:
+        os.kill(int(pid), sig)
+        return True
+    except OSError:
+        return False
+
+# Network open/read timeout of the in-process decoder; bounds how long stop() can wait
+_ENGINE_READ_TIMEOUT = 10.0
+
+class DecoderEngine:
+    """
+    In-process stream player: PyAV decodes (MP3/AAC/OGG/...), pyalsaaudio writes straight to ALSA,
+    so decoded PCM never crosses a pipe or a process boundary. Only used when both optional modules
+    import; otherwise the VLC/ffmpeg/mpg123 subprocess players are used.
+    """
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+        self.exited = threading.Event()  # set when the playback thread ends
+        self.exited.set()
+        self.error = None
+
+    @staticmethod
+    def available() -> bool:
+        return av is not None and alsaaudio is not None
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, stream_url: str, output_device: str, buffer_secs: int = 5, timeout: float = 10.0) -> bool:
+        """Start playback; True once the first period reaches ALSA, False if it failed before that."""
+        self.stop()
+        if self._thread is not None:
+            self.error = 'previous playback is still releasing the audio device'
+            return False
+        self._stop = threading.Event()
+        self.exited = threading.Event()
+        self.error = None
+        started = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(stream_url, output_device, buffer_secs, started, self._stop, self.exited),
+            daemon=True
+        )
+        self._thread.start()
+        started.wait(timeout)
+        if not self.exited.is_set() and started.is_set():
+            return True
+        self.stop()
+        return False
+
+    def stop(self, timeout: float = _ENGINE_READ_TIMEOUT + 1.0):
+        """
+        Ask the playback thread to finish and wait for it to close ALSA. It notices within one
+        period, or once a stalled network read times out; until it has, running() stays True.
+        """
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        if self.exited.is_set():
+            self._thread = None
+
+    def _run(self, stream_url, output_device, buffer_secs, started, stop, exited):
+        container = pcm = None
+        frame_bytes = CHANNELS * BYTES_PER_SAMPLE
+        try:
+            container = av.open(stream_url, timeout=_ENGINE_READ_TIMEOUT, options={
+                'reconnect': '1', 'reconnect_streamed': '1', 'reconnect_delay_max': '5'})
+            resampler = av.AudioResampler(format='s16', layout='stereo', rate=SAMPLE_RATE)
+            pcm = alsaaudio.PCM(
+                alsaaudio.PCM_PLAYBACK, alsaaudio.PCM_NORMAL, device=output_device,
+                channels=CHANNELS, rate=SAMPLE_RATE, format=alsaaudio.PCM_FORMAT_S16_LE,
+                periodsize=ALSA_PERIOD_FRAMES,
+                periods=_alsa_buffer_frames(buffer_secs) // ALSA_PERIOD_FRAMES
+            )
+            for frame in container.decode(audio=0):
+                if stop.is_set():
+                    break
+                out = resampler.resample(frame)
+                # PyAV 9+ returns a list of frames, older releases a single frame (or None)
+                for pcm_frame in (out if isinstance(out, list) else (out,)):
+                    if pcm_frame is None:
+                        continue
+                    # Packed s16: plane 0 holds interleaved frames (plus alignment padding)
+                    pcm.write(bytes(pcm_frame.planes[0])[:pcm_frame.samples * frame_bytes])
+                started.set()
+        except Exception as e:
+            self.error = str(e)
+            print(f"In-process decoder stopped: {e}")
+        finally:
+            for closable in (pcm, container):
+                try:
+                    if closable is not None:
+                        closable.close()
+                except Exception:
+                    pass
+            exited.set()
+            started.set()
+
+decoder_engine = DecoderEngine()
+
+# Guards the tracked decoder processes and the start token; never held while a player validates
+_decoder_lock = threading.RLock()
+_decoder_cond = threading.Condition(_decoder_lock)
+_decoder_starting = False  # start token: one start (user or supervisor) in flight at a time
+
+def _claim_decoder_start(timeout: float = 10.0) -> bool:
+    """
+    Take the start token for a user start. A start already in flight is cancelled first (its
+    players are killed as they come up), so this only waits for it to unwind.
+    """
+    global decoder_should_run, _decoder_starting
+    with _decoder_lock:
+        if _decoder_starting:
+            decoder_should_run = False
+            _decoder_wake.set()
+            _stop_decoder_pipeline()
+            if not _decoder_cond.wait_for(lambda: not _decoder_starting, timeout):
+                return False
+        _decoder_starting = True
+        return True
+
+def _release_decoder_start():
+    """Hand the start token back; a player that came up after a concurrent stop is killed here."""
+    global _decoder_starting
+    with _decoder_lock:
+        _decoder_starting = False
+        _decoder_cond.notify_all()
+        if not decoder_should_run and (decoder_process or decoder_aplay_process or decoder_engine.running()):
+            _stop_decoder_pipeline()
+
+def _track_decoder(proc, aplay_proc=None) -> bool:
+    """
+    Publish freshly spawned players so a concurrent stop can kill them mid-validation.
+    False (players already killed) if the stop came first.
+    """
+    global decoder_process, decoder_aplay_process
+    decoder_process, decoder_aplay_process = proc, aplay_proc
+    if decoder_should_run:
+        return True
+    _kill_pipeline(proc, aplay_proc)
+    decoder_process = decoder_aplay_process = None
+    return False
+
+def _start_decoder_ladder(url: str, out_dev: str, volume: int, buffer_secs: int, playback_cache_secs: int) -> bool:
+    """
+    Supervisor restart: in-process decoder first when installed, then VLC (best buffering and
+    quality), ffmpeg and mpg123. Runs without _decoder_lock and gives up once a stop arrives.
+    """
+    if DecoderEngine.available() and decoder_engine.start(url, out_dev, buffer_secs):
+        return True
+    for start in (_start_vlc_player, _start_ffmpeg_pipeline, _start_decoder_process):
+        if not decoder_should_run:
+            return False
+        if start(url, out_dev, volume, buffer_secs, playback_cache_secs):
+            return True
+    return False
+
+def _ensure_decoder_supervisor():
+    """Start the supervisor thread unless one is already running (it exits when the decoder stops)."""
+    global decoder_supervisor_thread
+    if decoder_supervisor_thread is None or not decoder_supervisor_thread.is_alive():
+        decoder_supervisor_thread = threading.Thread(target=_decoder_supervisor_loop, daemon=True)
+        decoder_supervisor_thread.start()
+
+# Restart policy: jittered exponential backoff, plus a cool-down after too many failures in a row
+_SUPERVISOR_MAX_FAILURES = 20
+_SUPERVISOR_COOLDOWN_SECS = 60.0
+# (state, retry_at monotonic time) published as one tuple for /api/status
+decoder_supervisor_state = ('idle', 0.0)
+
+def _set_supervisor_state(state: str, delay: float = 0.0):
+    global decoder_supervisor_state
+    decoder_supervisor_state = (state, time.monotonic() + delay)
+
+def _supervisor_state_dict() -> dict:
+    """Snapshot supervisor state for the UI, e.g. {'state': 'backoff', 'retryIn': 3.2}."""
+    state, retry_at = decoder_supervisor_state
+    return {'state': state, 'retryIn': round(max(0.0, retry_at - time.monotonic()), 1)}
+
+def _supervisor_backoff(backoff: float, max_backoff: float, consecutive_failures: int) -> float:
+    """Sleep before the next restart attempt and return the grown backoff."""
+    if consecutive_failures > _SUPERVISOR_MAX_FAILURES:
+        # Circuit breaker: stop hammering the upstream for a while
+        _set_supervisor_state('cooldown', _SUPERVISOR_COOLDOWN_SECS)
+        _decoder_wake.wait(_SUPERVISOR_COOLDOWN_SECS)
+        return 1.0
+    # Exponential backoff capped at max_backoff, with +/-25% jitter so restarts don't synchronize
+    backoff = min(backoff * 1.5, max_backoff)
+    delay = backoff * random.uniform(0.75, 1.25)
+    _set_supervisor_state('backoff', delay)
+    _decoder_wake.wait(delay)
+    return backoff
+
 def _decoder_supervisor_loop():
     """Keep decoder running while decoder_should_run is True; auto-restart on failures and network issues."""
-    global decoder_process, decoder_aplay_process
+    global decoder_process, decoder_aplay_process, _decoder_starting
     backoff = 1.0  # Start with 1 second backoff
     consecutive_failures = 0
     max_backoff = 10.0
     
     while decoder_should_run:
+        wait_engine = False
+        wait_pids = ()
+        failed = False
+        process_running = False
+        restart = None
         try:
-            st = load_status()
-            dec = st.get('decoder', {})
-            url = dec.get('url', '')
-            out_dev = dec.get('outputDevice', '') or _detect_default_devices().get('output', 'default')
-            volume = 100  # Always maximum volume
-            
-            if not url:
-                time.sleep(1.0)
-                continue
-            
-            # Check if decoder process is still running - BOTH must be running for pipeline
-            process_running = False
-            if decoder_process and decoder_process.poll() is None:
-                # If we have aplay_process, both must be running
-                if decoder_aplay_process:
-                    if decoder_aplay_process.poll() is None:
+            # Check under the lock the start/stop endpoints use; a restart claims the start token
+            # here and runs outside the lock, so a stop never waits out its validation window
+            with _decoder_lock:
+                if not decoder_should_run:
+                    break
+                if _decoder_starting:
+                    # A user start is in flight; look again once it hands the token back
+                    _decoder_cond.wait(1.0)
+                    continue
+                st = load_status()
+                dec = st.get('decoder', {})
+                url = dec.get('url', '')
+                out_dev = dec.get('outputDevice', '') or _detect_default_devices().get('output', 'default')
+                volume = 100  # Always maximum volume
+                
+                if url:
+                    # Check if decoder process is still running - BOTH must be running for pipeline
+                    if decoder_engine.running():
                         process_running = True
-                    else:
-                        # aplay died, need restart
-                        process_running = False
-                else:
-                    # No aplay (cvlc mode), just check main process
-                    process_running = True
-            else:
-                # Main process died, need restart
-                process_running = False
+                    elif decoder_process and decoder_process.poll() is None:
+                        # If we have aplay_process, both must be running (cvlc mode has none)
+                        process_running = decoder_aplay_process is None or decoder_aplay_process.poll() is None
+                    
+                    # If process not running, restart it (handles network failures, crashes, etc.)
+                    if not process_running:
+                        # Clean up any stale processes
+                        try:
+                            if decoder_process and decoder_process.poll() is not None:
+                                decoder_process = None
+                            if decoder_aplay_process and decoder_aplay_process.poll() is not None:
+                                decoder_aplay_process = None
+                        except:
+                            pass
+                        
+                        # Get buffer size and playback cache from config
+                        buffer_secs = int(dec.get('bufferSecs', 10))  # Increased default for better quality
+                        buffer_secs = max(1, min(60, buffer_secs))  # Clamp between 1 and 60
+                        playback_cache_secs = int(dec.get('playbackCacheSecs', 3))  # Increased default cache
+                        playback_cache_secs = max(0, min(10, playback_cache_secs))  # Clamp between 0 and 10
+                        _decoder_starting = True
+                        restart = (url, out_dev, volume, buffer_secs, playback_cache_secs)
             
-            # If process not running, restart it (handles network failures, crashes, etc.)
-            if not process_running:
-                # Clean up any stale processes
+            if restart:
                 try:
-                    if decoder_process and decoder_process.poll() is not None:
-                        decoder_process = None
-                    if decoder_aplay_process and decoder_aplay_process.poll() is not None:
-                        decoder_aplay_process = None
-                except:
-                    pass
-                
-                # Try to start decoder
-                success = False
-                # Get buffer size and playback cache from config
-                buffer_secs = int(dec.get('bufferSecs', 10))  # Increased default for better quality
-                buffer_secs = max(1, min(60, buffer_secs))  # Clamp between 1 and 60
-                playback_cache_secs = int(dec.get('playbackCacheSecs', 3))  # Increased default cache
-                playback_cache_secs = max(0, min(10, playback_cache_secs))  # Clamp between 0 and 10
-                # Try VLC first (best buffering and quality)
-                if _start_vlc_player(url, out_dev, volume, buffer_secs, playback_cache_secs):
-                    success = True
-                elif _start_ffmpeg_pipeline(url, out_dev, volume, buffer_secs, playback_cache_secs):
-                    success = True
-                elif _start_decoder_process(url, out_dev, volume, buffer_secs, playback_cache_secs):
-                    success = True
-                
-                if success:
+                    process_running = _start_decoder_ladder(*restart)
+                finally:
+                    _release_decoder_start()
+                if not decoder_should_run:
+                    break
+                failed = not process_running
+            if process_running:
+                wait_engine = decoder_engine.running()
+                wait_pids = tuple(proc.pid for proc in (decoder_process, decoder_aplay_process)
+                                  if proc is not None)
+            
+            if not url:
+                _decoder_wake.wait(1.0)
+            elif failed:
+                consecutive_failures += 1
+                backoff = _supervisor_backoff(backoff, max_backoff, consecutive_failures)
+                if consecutive_failures > _SUPERVISOR_MAX_FAILURES:
                     consecutive_failures = 0
-                    backoff = 1.0  # Reset backoff on success
-                    time.sleep(0.5)  # Give it a moment to validate
-                else:
-                    consecutive_failures += 1
-                    # Exponential backoff, but cap at max_backoff
-                    backoff = min(backoff * 1.5, max_backoff)
-                    time.sleep(backoff)
             else:
-                # Process is running, check periodically
+                # Process is running: block until one of the pipeline's children exits
                 consecutive_failures = 0
                 backoff = 1.0
-                time.sleep(2.0)  # Check every 2 seconds when running
+                _set_supervisor_state('running')
+                # Long timeout is only a safety net; restart normally happens on child death,
+                # which the pidfds report the moment it happens (no poll loop, no waiter threads)
+                if wait_engine:
+                    decoder_engine.exited.wait(timeout=30.0)
+                else:
+                    _wait_pids_exit(wait_pids, 30.0, first=True)
                 
         except Exception as e:
             consecutive_failures += 1
-            backoff = min(backoff * 1.5, max_backoff)
-            time.sleep(backoff)
+            backoff = _supervisor_backoff(backoff, max_backoff, consecutive_failures)
+            if consecutive_failures > _SUPERVISOR_MAX_FAILURES:
+                consecutive_failures = 0
+    _set_supervisor_state('idle')
+
+# Working mixer control per card ('' = default card), so restarts skip failing probes
+_AMIXER_CTRL_CACHE = {}
+_AMIXER_CONTROLS = ('Master', 'PCM', 'Speaker', 'Speaker Playback Volume', 'Headphone', 'Playback')
+
+def _alsa_card_number(output_device: str):
+    """Extract the card index from an hw:/plughw: device string (None for other devices)."""
+    if output_device.startswith('hw:') or output_device.startswith('plughw:'):
+        try:
+            return output_device.replace('plughw:', 'hw:').split(':')[1].split(',')[0]
+        except Exception:
+            pass
+    return None
+
+@lru_cache(maxsize=32)
+def _to_hw(device: str):
+    """'plughw:1,0' / 'hw:1,0' -> 'hw:1,0' (the capture-side name); None for anything else."""
+    hw = device.replace('plughw:', 'hw:') if device else ''
+    return hw if hw.startswith('hw:') and ',' in hw else None
+
+def _set_mixer_max(card_num=None):
+    """Set the card's playback mixer to 100% and unmute it with a single amixer call."""
+    try:
+        amixer_path = AMIXER_PATH
+        card_key = card_num or ''
+        card_args = ['-c', card_num] if card_num else []
+        cached = _AMIXER_CTRL_CACHE.get(card_key)
+        # Try the control that worked last time first, then the usual names (USB devices vary)
+        candidates = ([cached] if cached else []) + [c for c in _AMIXER_CONTROLS if c != cached]
+        for vol_control in candidates:
+            result = subprocess.run([amixer_path, *card_args, 'sset', vol_control, '100%', 'unmute'],
+                                    check=False, timeout=2, capture_output=True)
+            if result.returncode == 0:
+                _AMIXER_CTRL_CACHE[card_key] = vol_control
+                return True
+        _AMIXER_CTRL_CACHE.pop(card_key, None)
+    except Exception:
+        pass
+    return False
+
+# cvlc options that never change between starts (built once at import)
+# VLC --volume (0-256) for each 0-100 UI volume
+_VLC_VOLUME = tuple(int(v * 2.56) for v in range(101))
+_VLC_STATIC_ARGS = (
+    '--intf', 'dummy',
+    '--no-video',
+    '--quiet',
+    '--aout', 'alsa',
+    '--http-continuous',  # Continuous HTTP streaming
+    '--http-forward-cookies',  # Forward cookies for authentication
+    '--http-reconnect-delay', '2',  # Fast reconnect on failure
+    # Audio quality optimizations
+    '--audio-resampler', 'src',  # High-quality resampling
+    '--audio-filter', 'normvol',  # Normalize volume
+    '--norm-max-level', '1.0',  # Maximum normalization
+    # Network optimizations
+    '--network-timeout', '10000',  # 10 second timeout
+    '--http-reconnect',  # Auto-reconnect on HTTP streams
+    # Disable unnecessary features for better performance
+    '--no-sout-rtp-sap',
+    '--no-sout-standard-sap',
+    '--ttl=1',
+)
 
 def _start_vlc_player(stream_url: str, output_device: str, volume: int = 100, buffer_secs: int = 30, playback_cache_secs: int = 10) -> bool:
     """
     Start VLC (cvlc) player with excellent buffering and quality.
     VLC has the best network handling and buffer management.
     """
-    global decoder_process, decoder_aplay_process, decoder_current_volume
-    cvlc_path = shutil.which('cvlc') or '/usr/bin/cvlc'
-    if not os.path.exists(cvlc_path):
-        return False
+    global decoder_process, decoder_current_volume
+    if not os.path.exists(CVLC_PATH):
+        refresh_binpaths()  # Only on this failure path: VLC may have been installed since startup
+        if not os.path.exists(CVLC_PATH):
+            return False
+    cvlc_path = CVLC_PATH
     
     decoder_current_volume = volume
     
     try:
         # Set ALSA volume to maximum
-        try:
-            st = load_status()
-            output_dev = output_device
-            card_num = None
-            if output_dev.startswith('hw:') or output_dev.startswith('plughw:'):
-                try:
-                    parts = output_dev.replace('plughw:', 'hw:').split(':')[1].split(',')
-                    card_num = parts[0]
-                except:
-                    pass
-            amixer_path = shutil.which('amixer') or '/usr/bin/amixer'
-            volume_controls = ['Master', 'PCM', 'Speaker', 'Speaker Playback Volume', 'Headphone', 'Playback']
-            if card_num:
-                for vol_control in volume_controls:
-                    result = subprocess.run([amixer_path, '-c', card_num, 'sset', vol_control, '100%'], 
-                                          check=False, timeout=2, capture_output=True)
-                    if result.returncode == 0:
-                        subprocess.run([amixer_path, '-c', card_num, 'sset', vol_control, 'unmute'], 
-                                     check=False, timeout=2, capture_output=True)
-                        break
-        except:
-            pass
+        card_num = _alsa_card_number(output_device)
+        if card_num:
+            _set_mixer_max(card_num)
         
         # VLC volume is 0-256, so convert 0-100 to 0-256
-        vlc_volume = int(volume * 2.56)
+        vlc_volume = _VLC_VOLUME[max(0, min(100, int(volume)))]
         
         # Calculate cache times: buffer_secs for network, playback_cache_secs for pre-buffering
         # VLC uses milliseconds for caching
@@ -369,33 +1010,17 @@ def _start_vlc_player(stream_url: str, output_device: str, volume: int = 100, bu
         # Additional buffering for network streams
         file_cache_ms = network_cache_ms * 2  # File cache should be larger than network cache
         
-        # VLC command with optimized settings for best quality and buffering
+        # VLC command with optimized settings for best quality and buffering:
+        # constant options are prebuilt, only device/volume/caching/URL vary per start
         vlc_cmd = [
             cvlc_path,
-            '--intf', 'dummy',
-            '--no-video',
-            '--quiet',
-            '--aout', 'alsa',
+            *_VLC_STATIC_ARGS,
             f'--alsa-audio-device={output_device}',
             '--volume', str(vlc_volume),
             # Network buffering (critical for smooth playback) - AGGRESSIVE CACHING
             f'--network-caching={network_cache_ms}',
             f'--file-caching={file_cache_ms}',  # Larger file cache
             f'--live-caching={live_cache_ms}',  # Pre-buffer before starting
-            '--http-continuous',  # Continuous HTTP streaming
-            '--http-forward-cookies',  # Forward cookies for authentication
-            '--http-reconnect-delay', '2',  # Fast reconnect on failure
-            # Audio quality optimizations
-            '--audio-resampler', 'src',  # High-quality resampling
-            '--audio-filter', 'normvol',  # Normalize volume
-            '--norm-max-level', '1.0',  # Maximum normalization
-            # Network optimizations
-            '--network-timeout', '10000',  # 10 second timeout
-            '--http-reconnect',  # Auto-reconnect on HTTP streams
-            # Disable unnecessary features for better performance
-            '--no-sout-rtp-sap',
-            '--no-sout-standard-sap',
-            '--ttl=1',
             stream_url
         ]
         
@@ -403,17 +1028,21 @@ def _start_vlc_player(stream_url: str, output_device: str, volume: int = 100, bu
             vlc_cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            stdin=subprocess.DEVNULL
+            stdin=subprocess.DEVNULL,
+            start_new_session=True
         )
+        if not _track_decoder(cvlc_proc):
+            return False
         
         # Give VLC time to start and buffer (longer for network streams with large cache)
         # Wait longer to allow buffering to complete
         buffer_wait_time = max(5.0, (live_cache_ms / 1000.0) * 0.5)  # Wait at least 50% of cache time
-        time.sleep(buffer_wait_time)
+        _wait_pids_exit((cvlc_proc.pid,), buffer_wait_time)  # a VLC that dies fails fast
         
         if cvlc_proc.poll() is None:
-            decoder_process = cvlc_proc
-            decoder_aplay_process = None
+            # Startup errors are no longer needed; keep the pipes from filling up
+            _drain_pipe(cvlc_proc.stdout)
+            _drain_pipe(cvlc_proc.stderr)
             
             # Start audio level monitoring for VLC
             # Use arecord to capture from the output device (if it supports loopback)
@@ -422,25 +1051,59 @@ def _start_vlc_player(stream_url: str, output_device: str, volume: int = 100, bu
         else:
             # VLC failed to start
             try:
-                stderr_output = cvlc_proc.stderr.read().decode() if cvlc_proc.stderr else 'unknown error'
+                stderr_output = _read_ready((cvlc_proc.stderr,), 0.05, 4096)[0] or 'unknown error'
                 print(f"VLC failed to start: {stderr_output[:200]}")
-                cvlc_proc.terminate()
+                _kill_pipeline(cvlc_proc)
             except:
                 pass
+            if decoder_process is cvlc_proc:
+                decoder_process = None
             return False
     except Exception as e:
         print(f"VLC start exception: {e}")
         return False
 
+# Decoder level metering is currently disabled (the UI meter was removed)
+METER_ENABLED = False
+_HAS_SPLICE = hasattr(os, 'splice')
+_SPLICE_CHUNK = 65536
+
+def _splice_pcm(src_proc, dst_proc) -> bool:
+    """
+    Move PCM from src_proc.stdout to dst_proc.stdin with splice(2), never copying into userspace.
+    Returns True once the stream ends or the decoder is stopped, False if splice is unusable.
+    """
+    try:
+        # Push out anything still sitting in the Python-side write buffer first
+        dst_proc.stdin.flush()
+        src_fd = src_proc.stdout.fileno()
+        dst_fd = dst_proc.stdin.fileno()
+    except Exception:
+        return True
+    moved = False
+    while decoder_should_run:
+        try:
+            n = os.splice(src_fd, dst_fd, _SPLICE_CHUNK, flags=os.SPLICE_F_MOVE | os.SPLICE_F_MORE)
+        except BrokenPipeError:
+            return True  # aplay closed, let the supervisor restart
+        except OSError:
+            if moved:
+                return True
+            return False
+        if n == 0:
+            return True  # ffmpeg closed its stdout
+        moved = True
+    return True
+
 def _start_ffmpeg_pipeline(stream_url: str, output_device: str, volume: int = 100, buffer_secs: int = 5, playback_cache_secs: int = 2) -> bool:
     """
     Start ffmpeg to decode any stream to raw PCM and feed aplay.
     While piping, compute decoder levels from the PCM stream.
     Note: Volume is controlled via ALSA in real-time, not in ffmpeg filter.
     """
-    global decoder_process, decoder_aplay_process, decoder_current_volume
-    ffmpeg_path = shutil.which('ffmpeg') or '/usr/bin/ffmpeg'
-    aplay_path = shutil.which('aplay') or '/usr/bin/aplay'
+    global decoder_current_volume
+    ffmpeg_path = FFMPEG_PATH
+    aplay_path = APLAY_PATH
     if not os.path.exists(ffmpeg_path):
         return False
     
@@ -448,48 +1111,13 @@ def _start_ffmpeg_pipeline(stream_url: str, output_device: str, volume: int = 10
     decoder_current_volume = volume
     
     # Set initial ALSA volume
-    try:
-        st = load_status()
-        output_dev = output_device
-        card_num = None
-        if output_dev.startswith('hw:') or output_dev.startswith('plughw:'):
-            try:
-                parts = output_dev.replace('plughw:', 'hw:').split(':')[1].split(',')
-                card_num = parts[0]
-            except:
-                pass
-        amixer_path = shutil.which('amixer') or '/usr/bin/amixer'
-        # Try different volume control names (USB devices vary)
-        volume_controls = ['Master', 'PCM', 'Speaker', 'Speaker Playback Volume', 'Headphone', 'Playback']
-        if card_num:
-            for vol_control in volume_controls:
-                # Set volume to 100%
-                result = subprocess.run([amixer_path, '-c', card_num, 'sset', vol_control, '100%'], 
-                                      check=False, timeout=2, capture_output=True)
-                if result.returncode == 0:
-                    # Also unmute the control
-                    subprocess.run([amixer_path, '-c', card_num, 'sset', vol_control, 'unmute'], 
-                                 check=False, timeout=2, capture_output=True)
-                    break  # Success, found working control
-        else:
-            for vol_control in volume_controls:
-                # Set volume to 100%
-                result = subprocess.run([amixer_path, 'sset', vol_control, '100%'], 
-                                      check=False, timeout=2, capture_output=True)
-                if result.returncode == 0:
-                    # Also unmute the control
-                    subprocess.run([amixer_path, 'sset', vol_control, 'unmute'], 
-                                 check=False, timeout=2, capture_output=True)
-                    break  # Success, found working control
-    except:
-        pass
+    _set_mixer_max(_alsa_card_number(output_device))
     
     try:
         # Don't use volume filter in ffmpeg - use ALSA volume control instead for real-time adjustment
         # Enhanced buffering and reconnection for smooth playback
         # Calculate buffer size: seconds * sample_rate * channels * bytes_per_sample
-        # For 44.1kHz stereo 16-bit: buffer_secs * 44100 * 2 * 2 = buffer_secs * 176400 bytes
-        buffer_bytes = buffer_secs * 44100 * 2 * 2  # stereo 16-bit PCM
+        buffer_bytes = buffer_secs * PCM_BYTES_PER_SEC
         if buffer_bytes < 1024:
             buffer_size_str = f'{buffer_bytes}B'
         elif buffer_bytes < 1048576:
@@ -506,86 +1134,112 @@ def _start_ffmpeg_pipeline(stream_url: str, output_device: str, volume: int = 10
              '-fflags', '+genpts', '+discardcorrupt',  # Better error handling
              '-err_detect', 'ignore_err',  # Ignore minor errors
              '-i', stream_url, 
-             '-f', 's16le', '-ac', '2', '-ar', '44100', 
+             '-f', 's16le', '-ac', str(CHANNELS), '-ar', str(SAMPLE_RATE), 
              '-bufsize', buffer_size_str,  # User-configurable buffer size
              '-max_delay', '500000',  # 0.5 second max delay
              'pipe:1'],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            stdin=subprocess.DEVNULL
+            stdin=subprocess.DEVNULL,
+            bufsize=0,  # Unbuffered stdout so the splice pump never skips Python-buffered PCM
+            start_new_session=True
         )
+        _size_pcm_pipe(ffmpeg_proc.stdout)
         # Calculate ALSA buffer and period sizes for smooth playback
         # Period size: smaller = lower latency but more CPU, larger = smoother but more latency
         # Buffer size: should be multiple of period size, larger = more stable
         # For 44.1kHz: 1 period = ~23ms, 4 periods = ~92ms buffer
         # Use buffer_secs to calculate appropriate buffer size for smooth playback
-        period_frames = 1024  # ~23ms at 44.1kHz (good balance)
-        # Buffer should be at least buffer_secs worth of audio, but minimum 4 periods
-        min_buffer_frames = int(buffer_secs * 44100)  # Convert seconds to frames at 44.1kHz
-        buffer_frames = max(period_frames * 4, min_buffer_frames)  # At least 4 periods, or buffer_secs worth
-        buffer_frames = min(buffer_frames, 131072)  # Max reasonable buffer (about 3 seconds at 44.1kHz)
+        buffer_frames = _alsa_buffer_frames(buffer_secs)
         
         aplay_proc = subprocess.Popen(
-            [aplay_path, '-D', output_device, 
-             '-f', 'cd', '-c', '2', '-r', '44100',
+            [aplay_path, '-D', output_device, *_APLAY_PCM_ARGS,
              '-B', str(buffer_frames),  # Buffer size in frames
-             '-F', str(period_frames)],  # Period size in frames
+             '-F', str(ALSA_PERIOD_FRAMES)],  # Period size in frames
             stdin=subprocess.PIPE,
             stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
+            stderr=subprocess.DEVNULL,
+            bufsize=0,  # Raw stdin: each pump write goes straight to the pipe, no 8 KiB staging copy
+            start_new_session=True
         )
-        decoder_process = ffmpeg_proc
-        decoder_aplay_process = aplay_proc
+        _size_pcm_pipe(aplay_proc.stdin)
+        if not _track_decoder(ffmpeg_proc, aplay_proc):
+            return False
 
         def _pump_and_meter():
             # Volume is controlled via ALSA in real-time, no need to scale here
             # Use larger chunk size for better throughput and smoother playback
             chunk_size = 16384  # Increased for better throughput and fewer dropouts
-            playback_cache_bytes = playback_cache_secs * 44100 * 2 * 2  # Pre-buffer before playback
+            playback_cache_bytes = playback_cache_secs * PCM_BYTES_PER_SEC  # Pre-buffer before playback
             cache_buffer = bytearray()
-            cache_filled = False
+            cache_len = 0  # Bytes of valid PCM in cache_buffer
+            cache_pos = 0  # Read cursor into cache_buffer while draining
+            read_view = memoryview(bytearray(chunk_size))  # Reused for every post-cache read
+            # With the meter off there is nothing to inspect, so let the kernel move the PCM
+            splice_pcm = not METER_ENABLED and _HAS_SPLICE
             
             try:
                 # Pre-fill cache buffer before starting playback (improves quality)
                 # Add timeout to prevent infinite blocking
-                if playback_cache_bytes > 0:
-                    cache_timeout = time.time() + 10.0  # 10 second timeout for pre-buffering
-                    while len(cache_buffer) < playback_cache_bytes and decoder_should_run and time.time() < cache_timeout:
-                        data = ffmpeg_proc.stdout.read(min(chunk_size, playback_cache_bytes - len(cache_buffer))) if ffmpeg_proc.stdout else b''
-                        if not data:
-                            # Check if ffmpeg died
-                            if ffmpeg_proc.poll() is not None:
+                if playback_cache_bytes > 0 and ffmpeg_proc.stdout:
+                    # Preallocate once and read straight into it on each readiness event
+                    cache_buffer = bytearray(playback_cache_bytes)
+                    fd = ffmpeg_proc.stdout.fileno()
+                    poller = select.poll()
+                    poller.register(fd, select.POLLIN | select.POLLHUP)
+                    cache_deadline = time.monotonic() + 10.0  # 10 second timeout for pre-buffering
+                    with memoryview(cache_buffer) as cache_view:
+                        while cache_len < playback_cache_bytes and decoder_should_run:
+                            remaining = cache_deadline - time.monotonic()
+                            if remaining <= 0:
                                 break
-                            time.sleep(0.01)
-                            continue
-                        cache_buffer.extend(data)
-                    cache_filled = True
-                    # If we didn't fill cache but have some data, start anyway
-                    if len(cache_buffer) > 0:
-                        cache_filled = True
+                            if not poller.poll(remaining * 1000):
+                                continue
+                            n = os.readv(fd, [cache_view[cache_len:]])
+                            if n == 0:
+                                break  # ffmpeg closed its stdout
+                            cache_len += n
+                    # If the cache didn't fill before the deadline, start with what we have
                 
                 # Now start pumping data with cache support
                 while decoder_should_run and ffmpeg_proc and ffmpeg_proc.poll() is None and aplay_proc and aplay_proc.poll() is None:
                     # Read from cache first if available, then from stream
-                    if cache_buffer:
-                        data = bytes(cache_buffer[:chunk_size])
-                        cache_buffer = cache_buffer[chunk_size:]
+                    if cache_pos < cache_len:
+                        # Advance a cursor instead of re-slicing the remaining cache each chunk
+                        end = min(cache_pos + chunk_size, cache_len)
+                        with memoryview(cache_buffer) as cache_view:
+                            data = bytes(cache_view[cache_pos:end])
+                        cache_pos = end
+                        if cache_pos >= cache_len:
+                            cache_buffer = bytearray()
+                            cache_len = cache_pos = 0
+                    elif splice_pcm:
+                        # Cache drained: hand the rest of the stream to splice(2)
+                        if _splice_pcm(ffmpeg_proc, aplay_proc):
+                            break
+                        splice_pcm = False  # splice unsupported for these fds, use read/write
+                        continue
                     else:
-                        data = ffmpeg_proc.stdout.read(chunk_size) if ffmpeg_proc.stdout else b''
+                        # Read into the reusable chunk buffer; write() accepts the memoryview as-is.
+                        # stdout is unbuffered (raw FileIO), so readinto is one blocking read(2)
+                        # that returns whatever the pipe holds rather than filling chunk_size
+                        n = ffmpeg_proc.stdout.readinto(read_view) if ffmpeg_proc.stdout else 0
+                        data = read_view[:n] if n else b''
                     
                     if not data:
-                        # Reduced sleep for faster recovery from network hiccups
-                        time.sleep(0.005)
-                        continue
+                        # The read blocks until PCM arrives, so empty means ffmpeg closed its stdout
+                        break
                     
                     # Volume is controlled via ALSA in real-time, no need to scale here
                     # Write to aplay with error handling and larger writes for better throughput
                     try:
                         if aplay_proc.stdin:
-                            aplay_proc.stdin.write(data)
-                            aplay_proc.stdin.flush()
-                            # Small delay to prevent overwhelming the audio system
-                            time.sleep(0.001)
+                            # Unbuffered stdin: short reads go out at once instead of waiting in
+                            # Python. A raw write may be partial, so loop; the pipe blocks on its
+                            # own when aplay falls behind (natural backpressure)
+                            view = memoryview(data)
+                            while view:
+                                view = view[aplay_proc.stdin.write(view):]
                     except BrokenPipeError:
                         # aplay closed, break and let supervisor restart
                         break
@@ -594,16 +1248,13 @@ def _start_ffmpeg_pipeline(stream_url: str, output_device: str, volume: int = 10
                         time.sleep(0.005)
                         continue
                     # Measure levels (use original data before volume scaling for accurate metering)
-                    try:
-                        samples = array.array('h', data)
-                        if len(samples) >= 2:
-                            left = samples[0::2]
-                            right = samples[1::2]
-                            left_rms = (sum(x*x for x in left) / max(1, len(left))) ** 0.5
-                            right_rms = (sum(x*x for x in right) / max(1, len(right))) ** 0.5
+                    # Skipped entirely while the decoder meter is disabled - nothing consumes it
+                    if METER_ENABLED:
+                        try:
+                            left_rms, right_rms = _stereo_rms(data)
                             # Removed: decoder_audio_levels update (meter removed)
-                    except Exception:
-                        pass
+                        except Exception:
+                            pass
             finally:
                 try:
                     if aplay_proc and aplay_proc.stdin:
@@ -612,14 +1263,15 @@ def _start_ffmpeg_pipeline(stream_url: str, output_device: str, volume: int = 10
                     pass
 
         threading.Thread(target=_pump_and_meter, daemon=True).start()
-        # Give it a short moment to validate startup
-        time.sleep(1.5)  # Increased wait time for network streams to connect
+        # Give it a short moment to validate startup (network streams need time to connect);
+        # returns as soon as either child exits
+        _wait_pids_exit((ffmpeg_proc.pid, aplay_proc.pid), 1.5, first=True)
         
         # Check if processes are still running
         if ffmpeg_proc.poll() is not None:
             # ffmpeg exited, check stderr for error
             try:
-                stderr_data = ffmpeg_proc.stderr.read().decode()[:500] if ffmpeg_proc.stderr else ''
+                stderr_data = _read_ready((ffmpeg_proc.stderr,), 0.05)[0]
                 if stderr_data:
                     print(f"ffmpeg error: {stderr_data}")
             except:
@@ -629,34 +1281,116 @@ def _start_ffmpeg_pipeline(stream_url: str, output_device: str, volume: int = 10
         if aplay_proc.poll() is not None:
             # aplay exited, check stderr for error
             try:
-                stderr_data = aplay_proc.stderr.read().decode()[:500] if aplay_proc.stderr else ''
+                stderr_data = _read_ready((aplay_proc.stderr,), 0.05)[0]
                 if stderr_data:
                     print(f"aplay error: {stderr_data}")
             except:
                 pass
             return False
         
+        # Startup validated; discard ffmpeg's ongoing log output so it never blocks on stderr
+        _drain_pipe(ffmpeg_proc.stderr)
         return True
     except Exception as e:
         print(f"ffmpeg pipeline exception: {e}")
         return False
 
+def _port_listening(port: int):
+    """
+    True if a TCP socket is listening on port, per /proc/net/tcp{,6}; None if those can't be read.
+    Rows look like "0: 00000000:1F40 00000000:0000 0A ..." (local addr:port hex, state 0A = LISTEN).
+    """
+    needle = f':{port:04X}'.encode()
+    readable = False
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, 'rb') as f:
+                rows = f.read().splitlines()[1:]
+        except OSError:
+            continue
+        readable = True
+        for row in rows:
+            fields = row.split(None, 4)
+            if len(fields) > 3 and fields[3] == b'0A' and fields[1].endswith(needle):
+                return True
+    return False if readable else None
+
+def _lookup_ids(user: str, group: str) -> tuple:
+    """(uid, gid) for user/group, or (None, None) if either is unknown on this system."""
+    try:
+        return pwd.getpwnam(user).pw_uid, grp.getgrnam(group).gr_gid
+    except KeyError:
+        return None, None
+
+# Resolved once: getpwnam/getgrnam go through NSS on every call
+ICECAST_UID, ICECAST_GID = _lookup_ids('icecast2', 'icecast')
+_ICECAST_DIRS = ('/var/run/icecast2', '/var/log/icecast2')
+
+def _fix_icecast_dirs():
+    """
+    chown -R icecast2:icecast the run/log directories and chmod 755 the run directory.
+    Done in-process when we are root; otherwise (or on any failure) through sudo.
+    """
+    if os.geteuid() == 0 and ICECAST_UID is not None:
+        try:
+            for top in _ICECAST_DIRS:
+                if not os.path.isdir(top):
+                    continue
+                for root, dirs, files in os.walk(top):
+                    os.chown(root, ICECAST_UID, ICECAST_GID)
+                    for name in files:
+                        os.chown(os.path.join(root, name), ICECAST_UID, ICECAST_GID, follow_symlinks=False)
+            if os.path.isdir(_ICECAST_DIRS[0]):
+                os.chmod(_ICECAST_DIRS[0], 0o755)
+            return
+        except OSError:
+            pass
+    _run_quiet((SUDO_PATH, 'chown', '-R', 'icecast2:icecast', _ICECAST_DIRS[0]),
+               (SUDO_PATH, 'chmod', '755', _ICECAST_DIRS[0]),
+               (SUDO_PATH, 'chown', '-R', 'icecast2:icecast', _ICECAST_DIRS[1]))
+
+ICECAST_PID_FILE = Path('/var/run/icecast2/icecast.pid')  # <pidfile> in icecast.xml
+# (st_mtime_ns, pid) of the last pidfile read, so repeat probes cost one stat()
+_icecast_pid_cache = (None, None)
+
+def _icecast_pid_alive() -> bool:
+    """True if the pid in Icecast's pidfile is a live icecast process; False if unknown."""
+    global _icecast_pid_cache
+    try:
+        mtime = ICECAST_PID_FILE.stat().st_mtime_ns
+        cached_mtime, pid = _icecast_pid_cache
+        if mtime != cached_mtime:
+            pid = int(ICECAST_PID_FILE.read_bytes().split()[0])
+            _icecast_pid_cache = (mtime, pid)
+        # comm (not kill(pid, 0)) so a stale pidfile whose pid was reused doesn't count,
+        # and so it works though icecast runs as another user
+        with open(f'/proc/{pid}/comm', 'rb') as f:
+            return f.read().startswith(b'icecast')
+    except (OSError, ValueError, IndexError):
+        return False
+
+@_ttl_cache(_STATUS_TTL)
 def get_icecast_status():
     """Check if Icecast server is running"""
     try:
-        # Method 1: pgrep with pattern matching (most reliable - finds process with icecast2 in command)
-        pgrep_path = shutil.which('pgrep') or '/usr/bin/pgrep'
-        result = subprocess.run([pgrep_path, '-f', 'icecast2'], 
-                              capture_output=True, text=True, timeout=2)
-        # Check both return code and that we got output
-        if result.returncode == 0:
-            output = result.stdout.strip()
-            if output:  # Make sure we have actual output
-                return True
-        
-        # Method 2: Check if port 8000 is listening (Icecast default port)
+        # Method 0: the pidfile icecast writes - a stat (plus one tiny read) instead of a full scan
+        if _icecast_pid_alive():
+            return True
+
+        # Method 1: in-process /proc scan (shared, briefly cached walk; no pgrep fork)
+        # (a just-killed instance lingers as a zombie until reaped; that is not running)
+        if any(state != 'Z' for procs in _find_procs({'icecast2', 'icecast'}).values()
+               for _, state in procs):
+            return True
+
+        # Method 2: Check if port 8000 is listening (Icecast default port) in the kernel's
+        # socket table - no probe connection and no timeout
+        listening = _port_listening(8000)
+        if listening is not None:
+            return listening
+
+        # Method 3: connect probe, only where /proc/net is unavailable
         try:
-            import socket
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             sock.settimeout(0.3)
             result = sock.connect_ex(('127.0.0.1', 8000))
@@ -665,21 +1399,18 @@ def get_icecast_status():
                 return True
         except:
             pass
-        
-        # Method 3: pgrep with exact name (fallback)
-        result = subprocess.run([pgrep_path, '-x', 'icecast2'], 
-                              capture_output=True, text=True, timeout=2)
-        if result.returncode == 0 and result.stdout.strip():
-            return True
-        
+
         return False
     except Exception as e:
         # If all methods fail, return False
         return False
 
 def load_status() -> dict:
-    """Load persisted UI/runtime status data (decoder settings, etc.)."""
+    """Load persisted UI/runtime status data (decoder settings, etc.), including a queued write."""
     try:
+        pending = _status_pending
+        if pending is not None:
+            return json.loads(pending)
         if STATUS_FILE.exists():
             with open(STATUS_FILE, 'r') as f:
                 return json.load(f)
@@ -687,97 +1418,295 @@ def load_status() -> dict:
         pass
     return {}
 
+def _atomic_write(path: Path, data: bytes, mode: int = 0o600, sync_dir: bool = True):
+    """Write data to path crash-safely: one write to a temp file, fsync, rename over, fsync the directory.
+
+    The file is always fsynced before the rename, so after a power cut path holds either the
+    old or the new contents in full. sync_dir=False skips only the directory fsync: the rename
+    itself may then be lost, leaving the previous complete version in place.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    fd = os.open(str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+    if not sync_dir:
+        return
+    # Make the rename itself durable across a power cut
+    try:
+        dfd = os.open(str(path.parent), os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        try:
+            os.fsync(dfd)
+        finally:
+            os.close(dfd)
+    except OSError:
+        pass
+
+_status_written = (None, b'')  # (status.json st_mtime_ns, bytes last written by us)
+
+# Newest serialized status not yet on disk; the writer thread coalesces saves (last one wins)
+_status_pending = None
+_status_cond = threading.Condition()
+_status_writer = None
+
+def _write_status_blob(blob: bytes):
+    """Write one serialized status (skipped when the file already holds exactly this)."""
+    global _status_written
+    written_mtime, written_blob = _status_written
+    if blob == written_blob:
+        try:
+            if STATUS_FILE.stat().st_mtime_ns == written_mtime:
+                return  # Unchanged and nobody rewrote the file since
+        except OSError:
+            pass
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    _atomic_write(STATUS_FILE, blob, sync_dir=False)
+    _status_written = (STATUS_FILE.stat().st_mtime_ns, blob)
+
+def _status_writer_loop():
+    global _status_pending
+    while True:
+        with _status_cond:
+            while _status_pending is None:
+                _status_cond.wait()
+            blob = _status_pending
+        try:
+            _write_status_blob(blob)
+        except Exception as e:
+            print(f"Failed to write {STATUS_FILE}: {e}")
+        with _status_cond:
+            if _status_pending is blob:
+                _status_pending = None
+            _status_cond.notify_all()
+
+def _flush_status(timeout: float = 2.0):
+    """Wait (bounded) for a queued status write to reach the disk, e.g. at shutdown."""
+    with _status_cond:
+        _status_cond.wait_for(lambda: _status_pending is None, timeout)
+
+atexit.register(_flush_status)
+
 def save_status(status: dict) -> bool:
-    """Persist UI/runtime status data."""
+    """
+    Persist UI/runtime status data. Serialized here, written by a background thread so request
+    handlers never wait on the disk; False only if the status can't be serialized.
+    """
+    global _status_pending, _status_writer
     try:
-        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        tmp_path = STATUS_FILE.with_suffix('.json.tmp')
-        with open(tmp_path, 'w') as f:
-            json.dump(status, f)
-        os.replace(tmp_path, STATUS_FILE)
-        return True
+        if orjson is not None:
+            blob = orjson.dumps(status)
+        else:
+            blob = json.dumps(status, separators=(',', ':')).encode()
     except Exception:
         return False
+    with _status_cond:
+        _status_pending = blob
+        if _status_writer is None or not _status_writer.is_alive():
+            _status_writer = threading.Thread(target=_status_writer_loop, daemon=True)
+            _status_writer.start()
+        _status_cond.notify_all()
+    return True
+
+def _spawn_arecord(arecord_path, device, sample_rate):
+    """Start one continuous raw S16_LE stereo capture from `device` (runs until killed)."""
+    return subprocess.Popen(
+        [arecord_path, '-f', 'S16_LE', '-r', str(sample_rate), '-c', '2',
+         '-D', device, '-t', 'raw', '-q'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        bufsize=0,
+        start_new_session=True
+    )
+
+class _ArecordCapture:
+    """Meter source backed by a persistent arecord process (readinto() == 0 means it exited)."""
+
+    def __init__(self, arecord_path, device, sample_rate):
+        self.proc = _spawn_arecord(arecord_path, device, sample_rate)
+
+    def readinto(self, view) -> int:
+        return self.proc.stdout.readinto(view) or 0
+
+    def failed(self) -> bool:
+        return self.proc.poll() is not None and self.proc.returncode != 0
+
+    def close(self):
+        _kill_pipeline(self.proc)
+
+class _AlsaCapture:
+    """In-process meter source via pyalsaaudio: no arecord process and no pipe copy."""
+    proc = None
+
+    def __init__(self, device, sample_rate):
+        self.pcm = alsaaudio.PCM(
+            alsaaudio.PCM_CAPTURE, alsaaudio.PCM_NORMAL, device=device, channels=2,
+            rate=int(sample_rate), format=alsaaudio.PCM_FORMAT_S16_LE, periodsize=ALSA_PERIOD_FRAMES
+        )
+        self._pending = memoryview(b'')
+
+    def readinto(self, view) -> int:
+        while not self._pending:
+            length, data = self.pcm.read()  # blocks for one period (~23 ms)
+            if length < 0:
+                continue  # Overrun (-EPIPE): ALSA has recovered the stream, read again
+            self._pending = memoryview(data)
+        n = min(len(view), len(self._pending))
+        view[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def failed(self) -> bool:
+        return True  # Only asked after a read error
+
+    def close(self):
+        try:
+            self.pcm.close()
+        except Exception:
+            pass
+
+def _open_meter_capture(arecord_path, device, sample_rate):
+    """pyalsaaudio capture when installed and the device opens, else a persistent arecord."""
+    if alsaaudio is not None:
+        try:
+            return _AlsaCapture(device, sample_rate)
+        except Exception:
+            pass
+    return _ArecordCapture(arecord_path, device, sample_rate)
+
+_METER_WINDOW_SECS = 0.1    # RMS over the most recent 100 ms of capture
+_METER_PUBLISH_SECS = 0.05  # consumer refresh period
+_METER_READ_BYTES = 4096    # one ALSA period of S16 stereo per producer read
+
+def _meter_ring_size(window_bytes: int) -> int:
+    """Power-of-two ring at least 4 windows long, so the consumer's copy is never overrun."""
+    return 1 << (window_bytes * 4 - 1).bit_length()
 
 def read_audio_levels(device='hw:1,0', sample_rate=44100):
     """Read audio levels from ALSA device with auto-fallback to detected input device."""
-    global audio_levels, running
-    arecord_path = shutil.which('arecord') or '/usr/bin/arecord'
+    global audio_levels, running, audio_meter_process
+    arecord_path = ARECORD_PATH
     device_in_use = device
     empty_count = 0
     error_count = 0
-
-    while running:
-        try:
-            cmd = [arecord_path, '-f', 'S16_LE', '-r', str(sample_rate),
-                   '-c', '2', '-D', device_in_use, '-t', 'raw', '-d', '0.1', '-q']
-            process = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=0.8)
-
-            data = process.stdout
-            if process.returncode != 0 or len(data) < 4:
-                empty_count += 1
-                if process.returncode != 0:
-                    error_count += 1
-                # Attempt fallback if repeated failures
-                if empty_count >= 10 or error_count >= 3:
-                    try:
-                        defaults = _detect_default_devices()
-                        fallback_dev = defaults.get('input', device_in_use)
-                        if fallback_dev and fallback_dev != device_in_use:
-                            device_in_use = fallback_dev
-                            empty_count = 0
-                            error_count = 0
-                    except Exception:
-                        pass
-                time.sleep(0.15)
+    # Single-producer/single-consumer ring: this thread readinto()s captured audio at
+    # `written & mask`; the consumer thread only reads `written` (an int rebind is atomic
+    # under the GIL) and copies the latest window, so neither side ever waits on the other.
+    window = int(int(sample_rate) * 2 * 2 * _METER_WINDOW_SECS) & ~3
+    ring = bytearray(_meter_ring_size(window))
+    ring_view = memoryview(ring)
+    mask = len(ring) - 1
+    silence = bytes(window)  # idle sources send digital silence; memcmp beats squaring it
+    written = 0
+    stop = threading.Event()
+    capture = spawned = None
+
+    def _consume():
+        global audio_levels
+        seen = 0
+        while not stop.wait(_METER_PUBLISH_SECS):
+            head = written & ~3  # frame-aligned end of the freshest audio
+            if head == seen or head < window:
+                continue
+            seen = head
+            start = (head - window) & mask
+            if start + window <= len(ring):
+                data = ring[start:start + window]
+            else:
+                data = ring[start:] + ring[:start + window - len(ring)]
+            if data == silence:
+                audio_levels = (0.0, 0.0)
                 continue
+            try:
+                # Compute per-channel RMS (vectorized with NumPy when available)
+                left_rms, right_rms = _stereo_rms(data)
+                audio_levels = (min(left_rms / 32768.0, 1.0), min(right_rms / 32768.0, 1.0))
+            except Exception:
+                audio_levels = (0.0, 0.0)
 
-            # Convert to array and compute RMS
+    consumer = threading.Thread(target=_consume, daemon=True)
+    consumer.start()
+    try:
+        while running:
             try:
-                samples = array.array('h', data)
-                if len(samples) < 2:
-                    empty_count += 1
-                    time.sleep(0.1)
-                    continue
-                left_samples = [abs(samples[i]) for i in range(0, len(samples), 2) if i < len(samples)]
-                right_samples = [abs(samples[i+1]) for i in range(0, len(samples)-1, 2) if i+1 < len(samples)]
+                if capture is None:
+                    capture = _open_meter_capture(arecord_path, device_in_use, sample_rate)
+                    audio_meter_process = spawned = capture.proc
+                    written = (written + 3) & ~3  # a new capture starts on a frame boundary
 
-                if left_samples:
-                    left_rms = (sum(x*x for x in left_samples) / len(left_samples)) ** 0.5
-                    audio_levels['left'] = min(left_rms / 32768.0, 1.0)
-                else:
-                    audio_levels['left'] = 0.0
+                pos = written & mask
+                n = capture.readinto(ring_view[pos:min(pos + _METER_READ_BYTES, len(ring))])
 
-                if right_samples:
-                    right_rms = (sum(x*x for x in right_samples) / len(right_samples)) ** 0.5
-                    audio_levels['right'] = min(right_rms / 32768.0, 1.0)
-                else:
-                    audio_levels['right'] = 0.0
+                if not n:
+                    # EOF: arecord exited (device busy/missing)
+                    empty_count += 1
+                    if capture.failed():
+                        error_count += 1
+                    capture.close()
+                    capture = None
+                    audio_levels = (0.0, 0.0)
+                    # Attempt fallback if repeated failures
+                    if empty_count >= 10 or error_count >= 3:
+                        try:
+                            defaults = _detect_default_devices()
+                            fallback_dev = defaults.get('input', device_in_use)
+                            if fallback_dev and fallback_dev != device_in_use:
+                                device_in_use = fallback_dev
+                                empty_count = 0
+                                error_count = 0
+                        except Exception:
+                            pass
+                    _meter_stop.wait(0.15)
+                    continue
 
+                written += n
                 # Reset counters on success
                 empty_count = 0
                 error_count = 0
-            except Exception:
-                audio_levels = {'left': 0.0, 'right': 0.0}
 
-            time.sleep(0.1)
+            except Exception:
+                audio_levels = (0.0, 0.0)
+                error_count += 1
+                if capture is not None:
+                    capture.close()
+                capture = None
+                _meter_stop.wait(0.5)
+    finally:
+        stop.set()
+        if capture is not None:
+            capture.close()
+        if audio_meter_process is spawned:
+            audio_meter_process = None
+
+def _stop_audio_meter():
+    """Stop the meter thread and its persistent arecord so the capture device is released."""
+    global running
+    running = False
+    _meter_stop.set()
+    # Killing arecord unblocks the thread's pending read immediately
+    _kill_pipeline(audio_meter_process)
+    try:
+        if audio_level_thread and audio_level_thread.is_alive():
+            audio_level_thread.join(timeout=1.0)
+    except Exception:
+        pass
 
-        except Exception:
-            audio_levels = {'left': 0.0, 'right': 0.0}
-            error_count += 1
-            time.sleep(0.5)
+def _audio_levels_dict() -> dict:
+    """Snapshot the published (left, right) levels in the API's JSON shape."""
+    left, right = audio_levels
+    return {'left': left, 'right': right}
 
 def restart_audio_meter(device: str, sample_rate: int):
     """Restart the audio meter thread with the given device and sample rate."""
     global running, audio_level_thread
     try:
-        running = False
-        try:
-            if audio_level_thread and audio_level_thread.is_alive():
-                time.sleep(0.2)
-        except Exception:
-            pass
+        _stop_audio_meter()
         running = True
+        _meter_stop.clear()
         audio_level_thread = threading.Thread(
             target=read_audio_levels,
             args=(device, int(sample_rate)),
@@ -789,8 +1718,23 @@ def restart_audio_meter(device: str, sample_rate: int):
 
 # Removed: read_decoder_audio_levels() and start_decoder_meter_thread() functions (meter removed)
 
+_config_cache = (None, {})  # (darkice.conf st_mtime_ns, parsed config)
+# darkice.conf key -> config dict key, for the keys the UI edits
+_CFG_KEY_MAP = {'server': 'server', 'port': 'port', 'password': 'password', 'mountPoint': 'mountPoint',
+                'bitrate': 'bitrate', 'sampleRate': 'sampleRate', 'device': 'device',
+                'name': 'streamName', 'bufferSecs': 'bufferSecs'}
+
 def load_config():
-    """Load configuration from darkice.conf"""
+    """Load configuration from darkice.conf (reparsed only when the file's mtime changes)"""
+    global _config_cache
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    cached_mtime, cached = _config_cache
+    if mtime is not None and mtime == cached_mtime:
+        return dict(cached)
+
     config = {
         'server': 'localhost',
         'port': '8000',
@@ -803,38 +1747,26 @@ def load_config():
         'bufferSecs': '10'  # Increased default for better quality
     }
     
-    if CONFIG_FILE.exists():
+    if mtime is not None:  # The stat above already told us whether the file exists
         try:
             with open(CONFIG_FILE, 'r') as f:
                 content = f.read()
-                # Parse darkice.conf format
-                for line in content.split('\n'):
-                    line = line.strip()
-                    if 'server =' in line:
-                        config['server'] = line.split('=')[1].strip()
-                    elif 'port =' in line:
-                        config['port'] = line.split('=')[1].strip()
-                    elif 'password =' in line:
-                        config['password'] = line.split('=')[1].strip()
-                    elif 'mountPoint =' in line:
-                        config['mountPoint'] = line.split('=')[1].strip()
-                    elif 'bitrate =' in line:
-                        config['bitrate'] = line.split('=')[1].strip()
-                    elif 'sampleRate =' in line:
-                        config['sampleRate'] = line.split('=')[1].strip()
-                    elif 'device =' in line:
-                        config['device'] = line.split('=')[1].strip()
-                    elif 'name =' in line:
-                        config['streamName'] = line.split('=')[1].strip()
-                    elif 'bufferSecs =' in line:
-                        config['bufferSecs'] = line.split('=')[1].strip()
+                # Parse darkice.conf format: one partition at the first '=' and a dict lookup per line
+                for line in content.splitlines():
+                    key, sep, value = line.partition('=')
+                    if sep:
+                        target = _CFG_KEY_MAP.get(key.strip())
+                        if target is not None:
+                            config[target] = value.strip()
         except:
             pass
     
-    return config
+    _config_cache = (mtime, config)
+    return dict(config)
 
 def save_config(config):
     """Save configuration to darkice.conf"""
+    global _config_cache
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     
     # Get buffer size, default to 5 if not provided
@@ -872,8 +1804,8 @@ url = http://{config['server']}
 public = yes
 """
     
-    with open(CONFIG_FILE, 'w') as f:
-        f.write(config_content)
+    _atomic_write(CONFIG_FILE, config_content.encode())
+    _config_cache = (None, {})
     
     return True
 
@@ -951,19 +1883,24 @@ def api_login():
         if not username or not password:
             return jsonify({'success': False, 'message': 'Username and password required'}), 400
         
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        # Constant-time checks against the cached hash (refreshed by change-password);
+        # & rather than `and` so a wrong username takes as long as a wrong password
+        stored_hash = ADMIN_PASSWORD_HASH
+        username_ok = hmac.compare_digest(username.encode(), ADMIN_USERNAME.encode())
+        password_ok = _verify_password(password, stored_hash)
         
-        # Reload password hash in case it was changed
-        current_password_hash = load_password_hash()
-        
-        if username == ADMIN_USERNAME and password_hash == current_password_hash:
+        if username_ok & password_ok:
+            if _HAS_SCRYPT and _is_legacy_hash(stored_hash):
+                try:
+                    _store_password_hash(_hash_password(password))  # Upgrade to salted scrypt
+                except Exception:
+                    pass
             session['logged_in'] = True
             session['username'] = username
             return jsonify({'success': True, 'message': 'Login successful'})
         else:
             return jsonify({'success': False, 'message': 'Invalid username or password'}), 401
     except Exception as e:
-        import traceback
         return jsonify({'success': False, 'message': f'Error: {str(e)}', 'trace': traceback.format_exc()[:200]}), 500
 
 @app.route('/api/logout', methods=['POST'])
@@ -972,55 +1909,91 @@ def api_logout():
     session.clear()
     return jsonify({'success': True, 'message': 'Logged out successfully'})
 
+def _json_response(obj):
+    """jsonify(obj) via orjson when available (polled endpoints; C encoder, bytes out)."""
+    if orjson is not None:
+        return app.response_class(orjson.dumps(obj), mimetype='application/json')
+    return jsonify(obj)
+
 @app.route('/api/auth/status')
 def api_auth_status():
     """Check authentication status"""
-    return jsonify({
+    return _json_response({
         'logged_in': session.get('logged_in', False),
         'username': session.get('username', '')
     })
 
-@app.route('/api/status')
-def api_status():
-    """Get current status"""
-    return jsonify({
+_STATUS_REFRESH_SECS = 0.5
+_STATUS_IDLE_SECS = 10.0  # refresher exits when nobody has polled for this long
+# Published as a fresh dict each refresh (never mutated), so readers need no lock
+_status_snapshot = (0.0, None)
+_status_last_request = 0.0
+_status_thread = None
+_status_thread_lock = threading.Lock()
+
+def _collect_status() -> dict:
+    """Run the blocking probes (process scan, port connect, config stat)."""
+    return {
         'encoder': get_encoder_status(),
         'decoder': get_decoder_status(),
         'icecast': get_icecast_status(),
         'config': load_config(),
-        'audioLevels': audio_levels,
+    }
+
+def _status_refresh_loop():
+    """Refresh the status snapshot in the background while clients keep polling."""
+    global _status_snapshot, _status_thread
+    while True:
+        if time.monotonic() - _status_last_request > _STATUS_IDLE_SECS:
+            with _status_thread_lock:
+                if time.monotonic() - _status_last_request > _STATUS_IDLE_SECS:
+                    _status_thread = None
+                    return
+        try:
+            _status_snapshot = (time.monotonic(), _collect_status())
+        except Exception:
+            pass
+        time.sleep(_STATUS_REFRESH_SECS)
+
+def _status_snapshot_dict() -> dict:
+    """Latest probe results; the first poll after idling probes inline, later ones never block."""
+    global _status_snapshot, _status_last_request, _status_thread
+    _status_last_request = time.monotonic()
+    stamp, snapshot = _status_snapshot
+    if snapshot is None or _status_last_request - stamp > _STATUS_IDLE_SECS:
+        snapshot = _collect_status()
+        _status_snapshot = (time.monotonic(), snapshot)
+    if _status_thread is None:
+        with _status_thread_lock:
+            if _status_thread is None:
+                _status_thread = threading.Thread(target=_status_refresh_loop, daemon=True)
+                _status_thread.start()
+    return snapshot
+
+@app.route('/api/status')
+def api_status():
+    """Get current status"""
+    return _json_response({
+        **_status_snapshot_dict(),
+        'audioLevels': _audio_levels_dict(),
+        'decoderSupervisor': _supervisor_state_dict(),
     })
 
 @app.route('/api/config', methods=['GET'])
 def api_get_config():
     """Get configuration"""
-    return jsonify(load_config())
+    return _json_response(load_config())
 
 @app.route('/api/config', methods=['POST'])
 @login_required
 def api_save_config():
     """Save configuration"""
-    global audio_level_thread, running
     config = request.json
     if save_config(config):
         # Restart audio meter with new device/sampleRate
-        try:
-            # Stop current thread
-            running = False
-            try:
-                if audio_level_thread and audio_level_thread.is_alive():
-                    time.sleep(0.2)
-            except Exception:
-                pass
-            # Start new thread with updated config
-            running = True
+        try:
             new_cfg = load_config()
-            audio_level_thread = threading.Thread(
-                target=read_audio_levels,
-                args=(new_cfg.get('device', 'hw:1,0'), int(new_cfg.get('sampleRate', 44100))),
-                daemon=True
-            )
-            audio_level_thread.start()
+            restart_audio_meter(new_cfg.get('device', 'hw:1,0'), int(new_cfg.get('sampleRate', 44100)))
         except Exception:
             pass
         return jsonify({'success': True, 'message': 'Configuration saved'})
@@ -1032,7 +2005,7 @@ def api_encoder_start():
     """Start encoder"""
     global encoder_process
     
-    if get_encoder_status():
+    if get_encoder_status(fresh=True):
         return jsonify({'success': False, 'message': 'Encoder is already running'})
     
     if not CONFIG_FILE.exists():
@@ -1040,15 +2013,17 @@ def api_encoder_start():
     
     try:
         # Start darkice in background - use full path
-        darkice_path = shutil.which('darkice') or '/usr/bin/darkice'
+        darkice_path = DARKICE_PATH
         encoder_process = subprocess.Popen(
             [darkice_path, '-c', str(CONFIG_FILE)],
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stderr=subprocess.PIPE,
+            bufsize=0  # Control/log pipes only, no audio passes through here
         )
-        time.sleep(1)
+        # darkice that survives its first second is up; one that dies wakes us immediately
+        _wait_pids_exit((encoder_process.pid,), 1.0)
         
-        if get_encoder_status():
+        if get_encoder_status(fresh=True):
             return jsonify({'success': True, 'message': 'Encoder started successfully'})
         else:
             return jsonify({'success': False, 'message': 'Failed to start encoder'})
@@ -1061,29 +2036,81 @@ def api_encoder_stop():
     """Stop encoder"""
     global encoder_process
     
-    if not get_encoder_status():
+    if not get_encoder_status(fresh=True):
         return jsonify({'success': False, 'message': 'Encoder is not running'})
     
     try:
-        pkill_path = shutil.which('pkill') or '/usr/bin/pkill'
-        subprocess.run([pkill_path, '-x', 'darkice'], check=False)
-        time.sleep(0.5)
-        
+        # Our own darkice: terminate and wait on it directly
+        owned = None
         if encoder_process:
-            encoder_process.terminate()
+            owned = str(encoder_process.pid)
+            if encoder_process.poll() is None:
+                encoder_process.terminate()
+                if not _wait_pids_exit((encoder_process.pid,), 2.0):
+                    encoder_process.kill()
+            encoder_process.poll()  # Reap
             encoder_process = None
         
-        if not get_encoder_status():
+        # pkill only a darkice we didn't start (e.g. launched by systemd)
+        pids = [pid for pid, state in _find_procs({'darkice'}).get('darkice', ())
+                if pid != owned and state != 'Z']
+        if pids:
+            _run_quiet((PKILL_PATH, '-x', 'darkice'))
+            _wait_pids_exit(pids, 2.0)
+        
+        if not get_encoder_status(fresh=True):
             return jsonify({'success': True, 'message': 'Encoder stopped successfully'})
         else:
             return jsonify({'success': False, 'message': 'Failed to stop encoder'})
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
 
+def _build_decoder_error(last_error, proc):
+    """JSON failure response for api_decoder_start, classifying last_error for a helpful hint."""
+    # All methods failed - collect detailed error information
+    error_details = []
+
+    # Check if we have any error messages
+    if last_error:
+        error_details.append(f"Error: {last_error[:200]}")
+
+    # Try to get stderr from processes if they exist
+    try:
+        if proc and proc.stderr:
+            stderr_data = _read_ready((proc.stderr,), 0.05, 300)[0]
+            if stderr_data:
+                error_details.append(f"Process error: {stderr_data}")
+    except:
+        pass
+
+    # Check if it's a connection issue / an audio device issue (one scan each)
+    is_connection_error = bool(last_error) and _CONN_ERR_RE.search(last_error) is not None
+    is_device_error = bool(last_error) and _DEVICE_ERR_RE.search(last_error) is not None
+
+    # Build helpful error message
+    if is_connection_error:
+        error_msg = f'Cannot connect to stream URL. Please verify:\n1. Stream URL is correct and accessible\n2. Network connection is working\n3. Server is running and streaming\n\nDetails: {last_error[:200] if last_error else "Connection failed"}'
+    elif is_device_error:
+        error_msg = f'Audio output device error. Please:\n1. Check output device selection\n2. Try a different ALSA device (e.g., "plughw:2,0")\n3. Verify audio card is connected\n\nDetails: {last_error[:200] if last_error else "Device initialization failed"}'
+    else:
+        error_msg = f'Decoder failed to start. Please check:\n1. Stream URL is valid and accessible\n2. Output device is correct\n3. Network connection is working\n\nDetails: {" | ".join(error_details) if error_details else "All decoder methods failed"}'
+
+    return jsonify({'success': False, 'message': f'Failed to start decoder: {error_msg}'})
+
 @app.route('/api/decoder/start', methods=['POST'])
 @login_required
 def api_decoder_start():
     """Start decoder/player"""
+    # The start token (not the lock) is held while the player validates, so Stop stays instant
+    if not _claim_decoder_start():
+        return jsonify({'success': False, 'message': 'Another decoder start is still in progress'}), 409
+    try:
+        return _start_decoder_from_request()
+    finally:
+        _release_decoder_start()
+
+def _start_decoder_from_request():
+    """Body of api_decoder_start; runs holding the start token."""
     global decoder_process, decoder_aplay_process, decoder_should_run
     
     # CRITICAL: Initialize volume and buffer settings FIRST, before any other code
@@ -1093,21 +2120,12 @@ def api_decoder_start():
     playback_cache_secs = 10  # Much larger default cache for smoother playback
     
     # If decoder is running, stop it first (allows restart with new settings)
-    if get_decoder_status():
+    if get_decoder_status(fresh=True):
         # Stop existing decoder
         decoder_should_run = False
+        _decoder_wake.set()
         try:
-            if decoder_process:
-                decoder_process.terminate()
-                decoder_process = None
-            if decoder_aplay_process:
-                decoder_aplay_process.terminate()
-                decoder_aplay_process = None
-            # Kill any remaining processes
-            pkill_path = shutil.which('pkill') or '/usr/bin/pkill'
-            # Only kill VLC - we only use VLC now
-            subprocess.run([pkill_path, '-x', 'cvlc'], check=False, timeout=2)
-            time.sleep(1)
+            _stop_decoder_pipeline()
         except Exception:
             pass
     
@@ -1119,32 +2137,27 @@ def api_decoder_start():
     request_playback_cache_secs = data.get('playbackCacheSecs')
     
     # Normalize URL: prepend http:// if scheme is missing (e.g., 46.20.4.2:8010/;stream)
-    def normalize_url(u: str) -> str:
-        u = (u or '').strip()
-        if not u:
-            return u
-        # If no scheme like http:// or https:// is present, default to http://
-        if not re.match(r'^[a-zA-Z][a-zA-Z0-9+.-]*://', u):
-            return f'http://{u}'
-        return u
-    
     def parse_m3u_playlist(url: str) -> str:
         """Parse M3U playlist and return actual stream URL."""
         try:
-            import urllib.request
-            response = urllib.request.urlopen(url, timeout=5)
-            content = response.read().decode('utf-8', errors='ignore')
-            # M3U format: lines starting with # are metadata, others are URLs
-            for line in content.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # Found the stream URL
-                    if line.startswith('http://') or line.startswith('https://'):
-                        return line
-                    # Relative URL - construct from base
-                    if url.startswith('http'):
-                        base_url = '/'.join(url.split('/')[:-1])
-                        return f'{base_url}/{line}'
+            # Stream the playlist line by line and stop at the first entry (capped at 64 KiB)
+            with urllib.request.urlopen(url, timeout=5) as response:
+                remaining = 64 * 1024
+                while remaining > 0:
+                    raw = response.readline(remaining)
+                    if not raw:
+                        break
+                    remaining -= len(raw)
+                    line = raw.decode('utf-8', errors='ignore').strip()
+                    # M3U format: lines starting with # are metadata, others are URLs
+                    if line and not line.startswith('#'):
+                        # Found the stream URL
+                        if line.startswith('http://') or line.startswith('https://'):
+                            return line
+                        # Relative URL - construct from base
+                        if url.startswith('http'):
+                            base_url = '/'.join(url.split('/')[:-1])
+                            return f'{base_url}/{line}'
         except Exception:
             pass
         return url  # Return original if parsing fails
@@ -1158,7 +2171,7 @@ def api_decoder_start():
     if not stream_url:
         return jsonify({'success': False, 'message': 'Stream URL is required'})
     
-    # Initialize variables
+    # Initialize variables (anything still tracked here has already exited)
     decoder_process = None
     decoder_aplay_process = None
     last_error = None
@@ -1192,38 +2205,11 @@ def api_decoder_start():
         Attempt to automatically select a USB audio device for output.
         Falls back to 'default' if detection fails.
         """
-        try:
-            aplay_path_local = shutil.which('aplay') or '/usr/bin/aplay'
-            result = subprocess.run([aplay_path_local, '-l'], capture_output=True, text=True, timeout=2)
-            if result.returncode == 0:
-                lines = result.stdout.splitlines()
-                # Prefer a USB device if present
-                for i, line in enumerate(lines):
-                    lower = line.lower()
-                    if 'card' in lower and 'usb' in lower:
-                        # Typical format: "card 2: Device [USB PnP Sound Device], device 0: ..."
-                        try:
-                            parts = line.split(':', 1)[0].split()
-                            # parts like ["card", "2"]
-                            card_index = parts[1]
-                            return f'plughw:{card_index},0'
-                        except Exception:
-                            continue
-                # Otherwise pick first "card N" line
-                for line in lines:
-                    if line.strip().startswith('card '):
-                        try:
-                            parts = line.split(':', 1)[0].split()
-                            card_index = parts[1]
-                            return f'plughw:{card_index},0'
-                        except Exception:
-                            continue
-        except Exception:
-            pass
-        return 'default'
+        return _detect_default_devices()['output']
     
     try:
         decoder_should_run = True
+        _decoder_wake.clear()
         # Persist requested decoder settings (URL/output device), even if start fails
         try:
             st = load_status()
@@ -1242,29 +2228,31 @@ def api_decoder_start():
 
         # Restart audio meter on matching input card when a specific output device is chosen
         try:
-            dev_norm = output_device.replace('plughw:', 'hw:') if output_device else ''
-            if dev_norm.startswith('hw:') and ',' in dev_norm:
+            dev_norm = _to_hw(output_device)
+            if dev_norm:
                 restart_audio_meter(dev_norm, 44100)
                 # Removed: start_decoder_meter_thread() call (meter removed)
         except Exception:
             pass
 
-        # Start mpg123 in background - use full path
-        mpg123_path = shutil.which('mpg123') or '/usr/bin/mpg123'
-        aplay_path = shutil.which('aplay') or '/usr/bin/aplay'
-        
         # Resolve output device
         if not output_device:
             output_device = choose_output_device_fallback()
         
+        # Prefer the in-process decoder (PyAV + pyalsaaudio) when installed: no player subprocesses
+        if DecoderEngine.available():
+            if decoder_engine.start(stream_url, output_device, buffer_secs):
+                _ensure_decoder_supervisor()
+                return jsonify({'success': True, 'message': 'Decoder started successfully'})
+            last_error = decoder_engine.error
+        
         # Use VLC ONLY - it handles all formats (MP3, AAC, OGG, FLAC, etc.) and has best buffering
         # VLC buffers are stored in RAM for fast access
         if decoder_process is None:
-            if _start_vlc_player(stream_url, output_device, volume, buffer_secs, playback_cache_secs):
-                # Started successfully with VLC
-                time.sleep(0.5)
-            else:
+            if not _start_vlc_player(stream_url, output_device, volume, buffer_secs, playback_cache_secs):
                 decoder_process = None
+                if not decoder_should_run:
+                    return jsonify({'success': False, 'message': 'Decoder start cancelled by stop'})
                 # VLC not available - return error
                 return jsonify({
                     'success': False, 
@@ -1274,221 +2262,15 @@ def api_decoder_start():
         # VLC handles everything - no need for fallbacks
         # If VLC failed, we already returned an error above
         # If we get here, VLC started successfully
-            
-            # Use mpg123 with direct ALSA output (more reliable than piping)
-            env = os.environ.copy()
-            # Disable JACK completely
-            env.pop('JACK_PROMISCUOUS_SERVER', None)
-            env.pop('JACK_DEFAULT_SERVER', None)
-            env['MPG123_MODDIR'] = '/usr/lib/aarch64-linux-gnu/mpg123'
-            
-            try:
-                # Method 1: Try mpg123 with direct ALSA output (most reliable for USB devices)
-                # For ALSA output, we need to configure ALSA buffer size via environment or use larger internal buffer
-                # Calculate buffer size: buffer_secs * sample_rate * channels * bytes_per_sample
-                # For 44.1kHz stereo 16-bit: buffer_secs * 44100 * 2 * 2 = buffer_secs * 176400 bytes
-                # mpg123's internal buffer for ALSA is controlled by -b parameter, but it only works with -s mode
-                # For direct ALSA, we need to set ALSA buffer via period and buffer size
-                # Convert buffer_secs to ALSA period/buffer frames
-                # For smooth playback: period_frames = 1024, buffer_frames = period_frames * (buffer_secs * 44.1)
-                period_frames = 1024
-                # Buffer should be at least buffer_secs worth of audio
-                buffer_frames = max(period_frames * 4, int(buffer_secs * 44.1) * period_frames)
-                buffer_frames = min(buffer_frames, 65536)  # Max reasonable buffer
-                
-                # Set ALSA buffer environment variables for better buffering
-                env['ALSA_PCM_NAME'] = output_device
-                # Use larger buffer for better quality (reduce dropouts)
-                mpg123_cmd = [mpg123_path, '-q', '-o', 'alsa', '-a', output_device]
-                
-                # Add buffer size hint (mpg123 will use this for internal buffering)
-                # For direct ALSA, mpg123 uses ALSA's buffer, but we can hint with larger internal buffer
-                # Calculate internal buffer in frames (44100 samples/sec, so buffer_secs * 44100 frames)
-                internal_buffer_frames = int(buffer_secs * 44100)
-                internal_buffer_frames = max(4096, min(262144, internal_buffer_frames))  # Clamp between 4K and 256K frames
-                
-                # Note: mpg123 -o alsa doesn't support -b directly, but we can use ALSA configuration
-                # For now, we'll rely on ALSA's buffer configuration and add reconnection
-                mpg123_proc = subprocess.Popen(
-                    mpg123_cmd + [stream_url],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    stdin=subprocess.DEVNULL,
-                    env=env
-                )
-                
-                time.sleep(1)
-                
-                # Check if process is running
-                if mpg123_proc.poll() is None:
-                    # Success - mpg123 is running with direct ALSA output
-                    decoder_process = mpg123_proc
-                    decoder_aplay_process = None  # No aplay needed for direct ALSA
-                else:
-                    # Direct ALSA failed, try fallback with piping
-                    decoder_process = None
-                    last_error = f'mpg123 direct ALSA failed: {mpg123_proc.stderr.read().decode()[:200] if mpg123_proc.stderr else "unknown"}'
-                    
-                    # Fallback: Try piping method (better buffer control)
-                    try:
-                        # Calculate mpg123 buffer: buffer_secs * sample_rate * channels * bytes_per_sample
-                        # For 44.1kHz stereo 16-bit: buffer_secs * 44100 * 2 * 2 = buffer_secs * 176400 bytes
-                        mpg123_buffer_bytes = buffer_secs * 44100 * 2 * 2
-                        mpg123_buffer_bytes = max(4096, min(1048576, mpg123_buffer_bytes))  # Clamp between 4KB and 1MB
-                        
-                        mpg123_proc = subprocess.Popen(
-                            [mpg123_path, '-q', '-s', '-b', str(mpg123_buffer_bytes), stream_url],
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            stdin=subprocess.DEVNULL,
-                            env=env
-                        )
-                        
-                        # Calculate ALSA buffer and period sizes based on buffer_secs for smooth playback
-                        period_frames = 1024  # ~23ms at 44.1kHz
-                        # Buffer should be at least buffer_secs worth of audio, but minimum 4 periods
-                        # For 44.1kHz: buffer_secs * 44100 = total frames needed
-                        min_buffer_frames = int(buffer_secs * 44100)  # Convert seconds to frames at 44.1kHz
-                        buffer_frames = max(period_frames * 4, min_buffer_frames)  # At least 4 periods, or buffer_secs worth
-                        buffer_frames = min(buffer_frames, 131072)  # Max reasonable buffer (about 3 seconds at 44.1kHz)
-                        
-                        aplay_proc = subprocess.Popen(
-                            [aplay_path, '-D', output_device, '-f', 'cd', '-c', '2', '-r', '44100',
-                             '-B', str(buffer_frames), '-F', str(period_frames)],
-                            stdin=mpg123_proc.stdout,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE
-                        )
-                        mpg123_proc.stdout.close()
-                        
-                        time.sleep(1)
-                        if mpg123_proc.poll() is None and aplay_proc.poll() is None:
-                            decoder_process = mpg123_proc
-                            decoder_aplay_process = aplay_proc
-                    except Exception as e:
-                        decoder_process = None
-                        decoder_aplay_process = None
-                        last_error = f'Fallback piping also failed: {str(e)}'
-                
-                # If we got here and decoder_process is still None, both methods failed
-                if decoder_process is None:
-                    # Clean up any failed processes
-                    try:
-                        if 'mpg123_proc' in locals() and mpg123_proc.poll() is not None:
-                            mpg123_proc.terminate()
-                        if 'aplay_proc' in locals() and aplay_proc.poll() is not None:
-                            aplay_proc.terminate()
-                    except:
-                        pass
-                    
-                    # Only try fallback if stdout method completely failed
-                    if decoder_process is None:
-                        # Fallback A: Try VLC first (best buffering)
-                        if _start_vlc_player(stream_url, output_device, volume, buffer_secs, playback_cache_secs):
-                            decoder_process = decoder_process  # already set
-                            decoder_aplay_process = decoder_aplay_process
-                        # Fallback B: Try ffmpeg PCM pipeline (also provides decoder levels)
-                        elif _start_ffmpeg_pipeline(stream_url, output_device, volume, buffer_secs, playback_cache_secs):
-                            decoder_process = decoder_process  # already set
-                            decoder_aplay_process = decoder_aplay_process
-                        else:
-                            # Fallback B: Try cvlc directly to ALSA (handles AAC/m3u)
-                            try:
-                                cvlc_path = shutil.which('cvlc') or '/usr/bin/cvlc'
-                                # VLC volume is 0-256, so convert 0-100 to 0-256
-                                vlc_volume = int(volume * 2.56)
-                                cvlc_proc = subprocess.Popen(
-                                    [cvlc_path, '--intf', 'dummy', '--no-video', '--quiet',
-                                     '--aout', 'alsa', f'--alsa-audio-device={output_device}',
-                                     '--volume', str(vlc_volume), stream_url],
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE,
-                                    stdin=subprocess.DEVNULL
-                                )
-                                time.sleep(1)
-                                if cvlc_proc.poll() is None:
-                                    decoder_process = cvlc_proc
-                                    decoder_aplay_process = None
-                                else:
-                                    stderr_fallback = cvlc_proc.stderr.read().decode() if cvlc_proc.stderr else 'cvlc failed'
-                                    last_error = f'cvlc failed: {stderr_fallback[:200]}'
-                                    decoder_process = None
-                            except Exception as fallback_e:
-                                last_error = f'cvlc fallback failed: {str(fallback_e)}'
-                                decoder_process = None
 
-                    # Final fallback: mpg123 with Pulse (as a last resort)
-                    if decoder_process is None:
-                        try:
-                            decoder_process = subprocess.Popen(
-                                [mpg123_path, '-q', '-o', 'pulse', stream_url],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                stdin=subprocess.DEVNULL,
-                                env=env
-                            )
-                            time.sleep(1)
-                            if decoder_process.poll() is not None:
-                                stderr_fallback = decoder_process.stderr.read().decode() if decoder_process.stderr else 'pulse failed'
-                                last_error = f'Fallback pulse also failed: {stderr_fallback[:200]}'
-                                decoder_process = None
-                        except Exception as fallback_e:
-                            last_error = f'Fallback failed: {str(fallback_e)}'
-                            decoder_process = None
-            except Exception as e:
-                decoder_process = None
-                decoder_aplay_process = None
-                last_error = str(e)
-        
         # Check if we successfully started a process
         if decoder_process is None or decoder_process.poll() is not None:
-                            # All methods failed - collect detailed error information
-                            error_details = []
-                            
-                            # Check if we have any error messages
-                            if last_error:
-                                error_details.append(f"Error: {last_error[:200]}")
-                            
-                            # Try to get stderr from processes if they exist
-                            try:
-                                if decoder_process and decoder_process.stderr:
-                                    stderr_data = decoder_process.stderr.read().decode()[:300] if decoder_process.stderr else ''
-                                    if stderr_data:
-                                        error_details.append(f"Process error: {stderr_data}")
-                            except:
-                                pass
-                            
-                            # Check if it's a connection issue
-                            connection_errors = ['connection', 'resolve', 'network', 'timeout', 'refused']
-                            is_connection_error = any(err in (last_error or '').lower() for err in connection_errors)
-                            
-                            # Check if it's an audio device issue
-                            device_errors = ['driver', 'out123', 'alsa', 'device', 'no such file']
-                            is_device_error = any(err in (last_error or '').lower() for err in device_errors)
-                            
-                            # Build helpful error message
-                            if is_connection_error:
-                                error_msg = f'Cannot connect to stream URL. Please verify:\n1. Stream URL is correct and accessible\n2. Network connection is working\n3. Server is running and streaming\n\nDetails: {last_error[:200] if last_error else "Connection failed"}'
-                            elif is_device_error:
-                                error_msg = f'Audio output device error. Please:\n1. Check output device selection\n2. Try a different ALSA device (e.g., "plughw:2,0")\n3. Verify audio card is connected\n\nDetails: {last_error[:200] if last_error else "Device initialization failed"}'
-                            else:
-                                error_msg = f'Decoder failed to start. Please check:\n1. Stream URL is valid and accessible\n2. Output device is correct\n3. Network connection is working\n\nDetails: {" | ".join(error_details) if error_details else "All decoder methods failed"}'
-                            
-                            return jsonify({'success': False, 'message': f'Failed to start decoder: {error_msg}'})
+            return _build_decoder_error(last_error, decoder_process)
         
-        # Process is running, verify it's actually playing
-        time.sleep(0.5)
-        if get_decoder_status():
-            return jsonify({'success': True, 'message': 'Decoder started successfully'})
-        else:
-            # Process started but might not be playing yet, give it a moment
-            time.sleep(1)
-            if get_decoder_status():
-                return jsonify({'success': True, 'message': 'Decoder started successfully'})
-            else:
-                # Check for errors
-                stderr_output = decoder_process.stderr.read().decode() if decoder_process.stderr else ''
-                return jsonify({'success': False, 'message': f'Decoder started but may not be playing: {stderr_output[:200]}'})
+        # Process is running: _start_vlc_player has already waited out its buffering window.
+        # From here on the supervisor restarts it if it dies
+        _ensure_decoder_supervisor()
+        return jsonify({'success': True, 'message': 'Decoder started successfully'})
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
 
@@ -1506,31 +2288,34 @@ def api_get_decoder_config():
         'playbackCacheSecs': dec.get('playbackCacheSecs', 3)  # Increased default cache
     })
 
+# Saved-config clamps: (payload key, low, high)
+_DECODER_INT_FIELDS = (('volume', None, None), ('bufferSecs', 5, 120), ('playbackCacheSecs', 0, 30))
+
+def _parse_decoder_payload(payload: dict) -> dict:
+    """
+    Validate a decoder config payload in one pass: non-empty url/outputDevice strings and
+    clamped ints for the fields that are present. Raises ValueError/TypeError on bad numbers.
+    """
+    updates = {}
+    for key in ('url', 'outputDevice'):
+        value = str(payload.get(key, '')).strip()
+        if value:
+            updates[key] = value
+    for key, low, high in _DECODER_INT_FIELDS:
+        value = payload.get(key)
+        if value is not None:
+            value = int(value)
+            updates[key] = value if low is None else max(low, min(high, value))
+    return updates
+
 @app.route('/api/decoder/config', methods=['POST'])
 @login_required
 def api_save_decoder_config():
     """Persist decoder config (url, outputDevice, volume)."""
     try:
-        payload = request.get_json() or {}
-        url_val = str(payload.get('url', '')).strip()
-        out_dev = str(payload.get('outputDevice', '')).strip()
-        volume_val = payload.get('volume')
-        buffer_secs_val = payload.get('bufferSecs')
-        playback_cache_secs_val = payload.get('playbackCacheSecs')
+        updates = _parse_decoder_payload(request.get_json() or {})
         st = load_status()
-        st.setdefault('decoder', {})
-        if url_val:
-            st['decoder']['url'] = url_val
-        if out_dev:
-            st['decoder']['outputDevice'] = out_dev
-        if volume_val is not None:
-            st['decoder']['volume'] = int(volume_val)
-        if buffer_secs_val is not None:
-            buffer_secs_int = int(buffer_secs_val)
-            st['decoder']['bufferSecs'] = max(5, min(120, buffer_secs_int))  # Clamp between 5 and 120
-        if playback_cache_secs_val is not None:
-            playback_cache_int = int(playback_cache_secs_val)
-            st['decoder']['playbackCacheSecs'] = max(0, min(30, playback_cache_int))  # Clamp between 0 and 30
+        st.setdefault('decoder', {}).update(updates)
         if save_status(st):
             return jsonify({'success': True, 'message': 'Decoder config saved'})
         return jsonify({'success': False, 'message': 'Failed to save decoder config'}), 500
@@ -1541,37 +2326,18 @@ def api_save_decoder_config():
 @login_required
 def api_decoder_stop():
     """Stop decoder/player"""
-    global decoder_process, decoder_aplay_process, decoder_should_run
-    # Always try to stop, even if status probe says not running
+    global decoder_should_run
+    # Always try to stop, even if status probe says not running. Flag it before taking the lock:
+    # a start in flight sees it at once and kills whatever player it brings up
     decoder_should_run = False
+    _decoder_wake.set()
     
     try:
-        # Stop tracked processes if they exist
-        if decoder_process:
-            decoder_process.terminate()
-            decoder_process = None
-        
-        if decoder_aplay_process:
-            decoder_aplay_process.terminate()
-            decoder_aplay_process = None
+        # Kill tracked processes by process group; strays we don't own are signalled from the /proc scan
+        with _decoder_lock:
+            _stop_decoder_pipeline()
         
-        # Also use pkill as backup for all potential players
-        pkill_path = shutil.which('pkill') or '/usr/bin/pkill'
-        # Exact name matches
-        subprocess.run([pkill_path, '-x', 'mpg123'], check=False)
-        subprocess.run([pkill_path, '-x', 'aplay'], check=False)
-        subprocess.run([pkill_path, '-x', 'cvlc'], check=False)
-        subprocess.run([pkill_path, '-x', 'vlc'], check=False)
-        subprocess.run([pkill_path, '-x', 'ffmpeg'], check=False)
-        # Pattern matches, in case names differ
-        # Only VLC is used now - no need to kill mpg123
-        subprocess.run([pkill_path, '-f', 'aplay'], check=False)
-        subprocess.run([pkill_path, '-f', 'cvlc'], check=False)
-        subprocess.run([pkill_path, '-f', 'vlc'], check=False)
-        subprocess.run([pkill_path, '-f', 'ffmpeg'], check=False)
-        time.sleep(0.5)
-        
-        if not get_decoder_status():
+        if not get_decoder_status(fresh=True):
             return jsonify({'success': True, 'message': 'Decoder stopped successfully'})
         else:
             return jsonify({'success': False, 'message': 'Failed to stop decoder'})
@@ -1582,18 +2348,10 @@ def api_decoder_stop():
 def api_audio_devices():
     """Get list of audio devices"""
     try:
-        # Get input devices - use full paths
-        arecord_path = shutil.which('arecord') or '/usr/bin/arecord'
-        aplay_path = shutil.which('aplay') or '/usr/bin/aplay'
-        
-        result = subprocess.run([arecord_path, '-l'], 
-                              capture_output=True, text=True)
-        input_devices = result.stdout
-        
-        # Get output devices
-        result = subprocess.run([aplay_path, '-l'], 
-                              capture_output=True, text=True)
-        output_devices = result.stdout
+        # Cached listings; re-enumerated only when a card is plugged/unplugged
+        capture, playback = alsa_device_lists()
+        input_devices = capture.decode('utf-8', errors='replace')
+        output_devices = playback.decode('utf-8', errors='replace')
         
         return jsonify({
             'input': input_devices,
@@ -1602,6 +2360,110 @@ def api_audio_devices():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _alsa_cards_key() -> bytes:
+    """Contents of /proc/asound/cards: changes exactly when a card is plugged or unplugged."""
+    try:
+        with open('/proc/asound/cards', 'rb') as f:
+            return f.read()
+    except OSError:
+        return b''
+
+def _proc_alsa_lists(cards_key: bytes):
+    """
+    (capture, playback) listings in `arecord -l`/`aplay -l` format, built from /proc/asound alone
+    (no fork, no alsa-lib init); None if /proc/asound/pcm can't be read. cards_key lines look
+    like " 1 [Device         ]: USB-Audio - USB PnP Sound Device", pcm lines like
+    "01-00: USB Audio : USB Audio : playback 1 : capture 1".
+    """
+    try:
+        with open('/proc/asound/pcm', 'rb') as f:
+            pcm = f.read()
+    except OSError:
+        return None
+    cards = {}  # card number -> (id, name)
+    for line in cards_key.splitlines():
+        num, _, rest = line.strip().partition(b' ')
+        if num.isdigit() and rest.startswith(b'['):
+            card_id, _, desc = rest[1:].partition(b']')
+            cards[num] = (card_id.strip(), desc.partition(b' - ')[2].strip())
+    listings = ([], [])
+    for line in pcm.splitlines():
+        head, _, rest = line.partition(b': ')
+        card, _, device = head.partition(b'-')
+        fields = rest.split(b' : ')
+        if not card.isdigit() or not device.isdigit() or len(fields) < 3:
+            continue
+        card, device = card.lstrip(b'0') or b'0', device.lstrip(b'0') or b'0'
+        card_id, card_name = cards.get(card, (b'', b''))
+        entry = b'card %s: %s [%s], device %s: %s [%s]' % (card, card_id, card_name, device,
+                                                            fields[0].strip(), fields[1].strip())
+        for listing, direction in zip(listings, (b'capture', b'playback')):
+            if any(field.startswith(direction) for field in fields[2:]):
+                listing.append(entry)
+    return tuple(b'\n'.join(listing) + b'\n' if listing else b'' for listing in listings)
+
+_alsa_lists_cache = (None, None)  # (cards_key, listings) of the last complete enumeration
+
+def _alsa_device_lists(cards_key: bytes) -> tuple:
+    """
+    (arecord -l, aplay -l) style listings as bytes for one card set: read from /proc/asound,
+    or, where that isn't available, both tools run concurrently. Cached per card set, except
+    when a tool failed or timed out: that listing is retried on the next call.
+    """
+    global _alsa_lists_cache
+    cached_key, cached = _alsa_lists_cache
+    if cached is not None and cached_key == cards_key:
+        return cached
+    listings = _proc_alsa_lists(cards_key)
+    if listings is None:
+        listings, complete = _run_alsa_list_tools()
+        if not complete:
+            return listings
+    _alsa_lists_cache = (cards_key, listings)
+    return listings
+
+def _run_alsa_list_tools():
+    """Run `arecord -l` and `aplay -l` concurrently; (outputs, True if both succeeded)."""
+    procs = []
+    for tool in (ARECORD_PATH, APLAY_PATH):
+        try:
+            procs.append(subprocess.Popen([tool, '-l'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL))
+        except OSError:
+            procs.append(None)
+    outputs = []
+    complete = True
+    for proc in procs:
+        out = b''
+        if proc is None:
+            complete = False
+        else:
+            try:
+                out, _ = proc.communicate(timeout=3)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                out = b''
+            if proc.returncode != 0:
+                out = b''
+                complete = False
+        outputs.append(out)
+    return tuple(outputs), complete
+
+def alsa_device_lists() -> tuple:
+    """Cached (capture, playback) listings; re-enumerated only when the card set changes."""
+    return _alsa_device_lists(_alsa_cards_key())
+
+def _pick_card(listing: bytes):
+    """Card number from an `aplay -l`/`arecord -l` listing: first USB card, else first card."""
+    first = None
+    for match in _APLAY_CARD_RE.finditer(listing):
+        card_index, name = match.groups()
+        if b'usb' in name.lower():
+            return card_index.decode()  # Stop at the first USB card
+        if first is None:
+            first = card_index
+    return first.decode() if first is not None else None
+
 def _detect_default_devices() -> dict:
     """
     Detect sensible defaults for input/output ALSA devices.
@@ -1612,54 +2474,13 @@ def _detect_default_devices() -> dict:
         'output': 'default'
     }
     try:
-        arecord_path = shutil.which('arecord') or '/usr/bin/arecord'
-        aplay_path = shutil.which('aplay') or '/usr/bin/aplay'
-
-        # Parse capture (input)
-        input_card = None
-        r = subprocess.run([arecord_path, '-l'], capture_output=True, text=True, timeout=3)
-        if r.returncode == 0:
-            lines = r.stdout.splitlines()
-            # USB first
-            for line in lines:
-                line_l = line.lower()
-                if line_l.strip().startswith('card ') and 'usb' in line_l:
-                    m = re.search(r'card\\s+(\\d+)', line, flags=re.IGNORECASE)
-                    if m:
-                        input_card = m.group(1)
-                        break
-            if input_card is None:
-                for line in lines:
-                    m = re.search(r'card\\s+(\\d+)', line, flags=re.IGNORECASE)
-                    if m:
-                        input_card = m.group(1)
-                        break
-            if input_card is not None:
-                defaults['input'] = f'hw:{input_card},0'
-
-        # Parse playback (output)
-        output_card = None
-        r = subprocess.run([aplay_path, '-l'], capture_output=True, text=True, timeout=3)
-        if r.returncode == 0:
-            lines = r.stdout.splitlines()
-            # USB first
-            for line in lines:
-                line_l = line.lower()
-                if line_l.strip().startswith('card ') and 'usb' in line_l:
-                    m = re.search(r'card\\s+(\\d+)', line, flags=re.IGNORECASE)
-                    if m:
-                        output_card = m.group(1)
-                        break
-            if output_card is None:
-                for line in lines:
-                    m = re.search(r'card\\s+(\\d+)', line, flags=re.IGNORECASE)
-                    if m:
-                        output_card = m.group(1)
-                        break
-            if output_card is not None:
-                defaults['output'] = f'plughw:{output_card},0'
-            else:
-                defaults['output'] = 'default'
+        capture, playback = alsa_device_lists()
+        input_card = _pick_card(capture)
+        if input_card is not None:
+            defaults['input'] = f'hw:{input_card},0'
+        output_card = _pick_card(playback)
+        if output_card is not None:
+            defaults['output'] = f'plughw:{output_card},0'
     except Exception:
         pass
     return defaults
@@ -1672,111 +2493,214 @@ def api_audio_defaults():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _port_owner_pids(port: int) -> list:
+    """Pids holding a listening TCP socket on port: /proc/net/tcp{,6} inode -> /proc/<pid>/fd link."""
+    needle = f':{port:04X}'.encode()
+    targets = set()
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table, 'rb') as f:
+                rows = f.read().splitlines()[1:]
+        except OSError:
+            continue
+        for row in rows:
+            fields = row.split()
+            if len(fields) > 9 and fields[3] == b'0A' and fields[1].endswith(needle):
+                targets.add(f'socket:[{fields[9].decode()}]')
+    pids = []
+    if not targets:
+        return pids
+    own_pid = str(os.getpid())  # never report (and so never kill) this app
+    with os.scandir('/proc') as it:
+        for entry in it:
+            if not entry.name.isdigit() or entry.name == own_pid:
+                continue
+            try:
+                fds = os.listdir(f'/proc/{entry.name}/fd')
+            except OSError:
+                continue  # Exited, or another user's process
+            for fd in fds:
+                try:
+                    if os.readlink(f'/proc/{entry.name}/fd/{fd}') in targets:
+                        pids.append(entry.name)
+                        break
+                except OSError:
+                    continue
+    return pids
+
+def _read_ready(pipes, timeout: float, limit: int = 500) -> tuple:
+    """
+    Wait once for any of `pipes` to be readable; return up to `limit` decoded bytes from each.
+    Bounded in time and size, so it is safe on a child that is still running (unlike .read()).
+    """
+    fds = [p for p in pipes if p is not None]
+    ready = set()
+    try:
+        ready = set(select.select(fds, [], [], timeout)[0]) if fds else set()
+    except (OSError, ValueError):
+        pass
+    out = []
+    for p in pipes:
+        text = ''
+        if p is not None and p in ready:
+            try:
+                text = os.read(p.fileno(), limit).decode(errors='replace')
+            except OSError:
+                pass
+        out.append(text)
+    return tuple(out)
+
+def _wait_for(pred, timeout: float, initial: float = 0.05, max_interval: float = 0.3) -> bool:
+    """Poll pred() with exponential backoff (50, 100, 200, 300 ms...); True as soon as it holds."""
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        if pred():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_interval)
+
+def _wait_icecast_up(timeout: float) -> bool:
+    """True as soon as Icecast is up (process or listener), False once `timeout` passes."""
+    return _wait_for(lambda: get_icecast_status(fresh=True), timeout)
+
+# Icecast start runs off the request thread: (job_id, 'running'|'done', result dict, HTTP status)
+_icecast_job = (0, 'idle', None, 200)
+_icecast_job_lock = threading.Lock()
+
+def _run_icecast_start_job(job_id: int):
+    """Background worker for /api/icecast/start; publishes the result for /api/icecast/status."""
+    global _icecast_job
+    try:
+        with app.app_context():
+            rv = _start_icecast()
+            response, code = rv if isinstance(rv, tuple) else (rv, 200)
+            result = response.get_json()
+    except Exception as e:
+        result, code = {'success': False, 'message': f'Error: {str(e)}'}, 500
+    _icecast_job = (job_id, 'done', result, code)
+
 @app.route('/api/icecast/start', methods=['POST'])
 @login_required
 def api_icecast_start():
-    """Start Icecast server"""
+    """Start Icecast server in the background; poll /api/icecast/status for the outcome"""
+    global _icecast_job
+    with _icecast_job_lock:
+        job_id, state, _, _ = _icecast_job
+        if state != 'running':
+            job_id += 1
+            _icecast_job = (job_id, 'running', None, 200)
+            threading.Thread(target=_run_icecast_start_job, args=(job_id,), daemon=True).start()
+    return jsonify({'success': True, 'pending': True, 'jobId': job_id,
+                    'message': 'Starting Icecast server...'}), 202
+
+@app.route('/api/icecast/status')
+@login_required
+def api_icecast_job_status():
+    """Outcome of the latest Icecast start job, plus the live running state"""
+    job_id, state, result, code = _icecast_job
+    return jsonify({'jobId': job_id, 'state': state, 'result': result, 'code': code,
+                    'icecast': get_icecast_status()})
+
+def _start_icecast():
+    """Start Icecast server (blocking; runs in the start job thread)"""
     # First, stop any existing Icecast instance
-    if get_icecast_status():
+    if get_icecast_status(fresh=True):
         # Stop existing instance
-        try:
-            subprocess.run(['systemctl', 'stop', 'icecast2'], capture_output=True, timeout=3)
-            time.sleep(1)
-        except:
-            pass
+        _run_quiet(_SYSTEMCTL_STOP_ICECAST, timeout=3.0)
         # Kill any remaining processes
-        pkill_path = shutil.which('pkill') or '/usr/bin/pkill'
-        subprocess.run([pkill_path, '-9', '-x', 'icecast2'], capture_output=True, timeout=2)
-        time.sleep(1)
+        pids = [pid for pid, _ in _find_procs({'icecast2'}).get('icecast2', ())]
+        _run_quiet((PKILL_PATH, '-9', '-x', 'icecast2'))
+        _wait_pids_exit(pids, 1.0)
     
-    # Check if port 8000 is in use and free it
+    # Check if port 8000 is in use and free it: find the owners via /proc (no lsof fork)
     try:
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('127.0.0.1', 8000))
-        sock.close()
-        if result == 0:
-            # Port is in use, try to find and kill the process
+        in_use = _port_listening(8000)
+        if in_use is None:
+            # /proc/net unavailable: a bind probe tells us whether the port is taken
+            probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             try:
-                # Find process using port 8000
-                lsof_path = shutil.which('lsof') or '/usr/bin/lsof'
-                result = subprocess.run([lsof_path, '-ti:8000'], capture_output=True, text=True, timeout=2)
-                if result.returncode == 0 and result.stdout.strip():
-                    pid = result.stdout.strip()
-                    subprocess.run(['kill', '-9', pid], timeout=2)
-                    time.sleep(1)
-            except:
-                # Try with fuser or pkill
+                probe.bind(('', 8000))
+                in_use = False
+            except OSError:
+                in_use = True
+            finally:
+                probe.close()
+        if in_use:
+            pids = _port_owner_pids(8000)
+            killed = []
+            for pid in pids:
                 try:
-                    fuser_path = shutil.which('fuser') or '/usr/bin/fuser'
-                    sudo_path_temp = shutil.which('sudo') or '/usr/bin/sudo'
-                    subprocess.run([sudo_path_temp, fuser_path, '-k', '8000/tcp'], timeout=2)
-                    time.sleep(1)
-                except:
+                    os.kill(int(pid), signal.SIGKILL)
+                    killed.append(pid)
+                except ProcessLookupError:
+                    killed.append(pid)
+                except OSError:
+                    pass  # Owned by another user (icecast2)
+            if pids and len(killed) == len(pids):
+                _wait_pids_exit(killed, 1.0)
+            else:
+                # Not ours to kill (or owners not visible): let fuser do it as root
+                _run_quiet((SUDO_PATH, '-n', FUSER_PATH, '-k', '8000/tcp'))
+                _wait_pids_exit(pids, 1.0)
+                if _port_listening(8000):
                     # Last resort: pkill all icecast2
-                    pkill_path = shutil.which('pkill') or '/usr/bin/pkill'
-                    subprocess.run([pkill_path, '-9', '-x', 'icecast2'], timeout=2)
-                    time.sleep(1)
+                    _run_quiet((PKILL_PATH, '-9', '-x', 'icecast2'))
     except:
         pass
     
     try:
         # Try using systemctl first (preferred method)
         try:
-            result = subprocess.run(['systemctl', 'start', 'icecast2'],
+            result = subprocess.run([SYSTEMCTL_PATH, 'start', 'icecast2'],
                                   capture_output=True, text=True, timeout=5)
             if result.returncode == 0:
-                time.sleep(2)
-                if get_icecast_status():
+                if _wait_icecast_up(2.0):
                     return jsonify({'success': True, 'message': 'Icecast server started successfully'})
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
         
         # Fallback: Try running icecast2 directly with full path
-        icecast2_path = shutil.which('icecast2') or '/usr/bin/icecast2'
-        sudo_path = shutil.which('sudo') or '/usr/bin/sudo'
+        icecast2_path = ICECAST2_PATH
+        sudo_path = SUDO_PATH
         
         # Ensure directories have correct permissions before starting
-        try:
-            # Fix permissions on run directory - user is icecast2, group is icecast
-            subprocess.run([sudo_path, 'chown', '-R', 'icecast2:icecast', '/var/run/icecast2'], 
-                         capture_output=True, timeout=2)
-            subprocess.run([sudo_path, 'chmod', '755', '/var/run/icecast2'], 
-                         capture_output=True, timeout=2)
-            # Also ensure log directory is writable
-            subprocess.run([sudo_path, 'chown', '-R', 'icecast2:icecast', '/var/log/icecast2'], 
-                         capture_output=True, timeout=2)
-        except:
-            pass
+        # Fix permissions on run directory - user is icecast2, group is icecast;
+        # also ensure log directory is writable
+        _fix_icecast_dirs()
         
         if sudo_path and os.path.exists(sudo_path):
             # Start as root so icecast can change to icecast2 user (changeowner only works as root)
-            # Icecast will drop privileges to icecast2:icecast as configured
+            # Icecast will drop privileges to icecast2:icecast as configured.
+            # start_new_session does the setsid() in C, so the child keeps the vfork fast path
+            # that a preexec_fn would disable (and no Python runs between fork and exec)
             process = subprocess.Popen([sudo_path, icecast2_path, '-c', '/etc/icecast2/icecast.xml', '-b'],
                             stdout=subprocess.PIPE,
                             stderr=subprocess.PIPE,
-                            preexec_fn=os.setsid if hasattr(os, 'setsid') else None)
+                            start_new_session=True)
         else:
             # Last resort: try running icecast2 directly (if permissions allow)
             process = subprocess.Popen([icecast2_path, '-c', '/etc/icecast2/icecast.xml', '-b'],
                             stdout=subprocess.PIPE,
                             stderr=subprocess.PIPE,
-                            preexec_fn=os.setsid if hasattr(os, 'setsid') else None)
+                            start_new_session=True)
         
-        # Wait longer for Icecast to start and drop privileges
-        time.sleep(4)
-        
-        # Check if process is running first
-        if get_icecast_status():
+        # Wait for Icecast to start and drop privileges (returns as soon as it is up). A launcher
+        # that exits non-zero (config/permission/bind error) ends the wait at once so its output
+        # is read below; exit 0 is the normal daemon-mode detach, so that keeps waiting.
+        launch_failed = lambda: process.poll() not in (None, 0)
+        if _wait_for(lambda: launch_failed() or get_icecast_status(fresh=True), 4.0) and not launch_failed():
             return jsonify({'success': True, 'message': 'Icecast server started successfully'})
         
         # Check process status - it might still be starting
         if process.poll() is None:
-            # Process is still running, give it more time and check again
-            for attempt in range(3):
-                time.sleep(2)
-                if get_icecast_status():
-                    return jsonify({'success': True, 'message': 'Icecast server started successfully'})
+            # Process is still running, give it more time
+            if _wait_icecast_up(6.0):
+                return jsonify({'success': True, 'message': 'Icecast server started successfully'})
         
         # These are success messages, not errors
         success_indicators = [
@@ -1791,36 +2715,15 @@ def api_icecast_start():
         # Icecast prints messages before forking, so we can read them
         try:
             # Try to read output (use select or just read with timeout)
-            import select
             error_msg = ''
             stdout_output = ''
             stderr_output = ''
             
-            # Wait a bit for output, then try to read
-            time.sleep(1)
-            
-            # Try non-blocking read
-            try:
-                if process.stdout:
-                    # Check if data is available (non-blocking)
-                    ready, _, _ = select.select([process.stdout], [], [], 0.1)
-                    if ready:
-                        stdout_output = process.stdout.read(500).decode() if process.stdout else ''
-            except:
-                pass
+            # In daemon mode the parent exits right after printing; wait for that, then read
+            _wait_pids_exit((process.pid,), 1.0)
             
-            try:
-                if process.stderr:
-                    ready, _, _ = select.select([process.stderr], [], [], 0.1)
-                    if ready:
-                        stderr_output = process.stderr.read(500).decode() if process.stderr else ''
-            except:
-                # If select not available, try direct read (might block briefly)
-                try:
-                    if process.stderr:
-                        stderr_output = process.stderr.read(500).decode() if process.stderr else ''
-                except:
-                    pass
+            # One select over both pipes, then read whichever have output (no sequential waits)
+            stdout_output, stderr_output = _read_ready((process.stdout, process.stderr), 0.1)
             
             error_msg = stderr_output[:500] if stderr_output else stdout_output[:500]
             
@@ -1828,24 +2731,11 @@ def api_icecast_start():
             if any(indicator in error_msg for indicator in success_indicators):
                 # These are success messages - Icecast forks in daemon mode, so parent exits
                 # but child continues running. Check the actual Icecast process, not parent.
-                for attempt in range(4):
-                    time.sleep(1.5)
-                    if get_icecast_status():
-                        return jsonify({'success': True, 'message': 'Icecast server started successfully'})
-                
-                # Final check - if we saw success messages, trust them
-                # The parent process exiting is normal for daemon mode
-                if get_icecast_status():
+                if _wait_icecast_up(8.0):
                     return jsonify({'success': True, 'message': 'Icecast server started successfully'})
-                else:
-                    # Even if status check fails, if we saw success messages, it likely worked
-                    # Give it one more moment
-                    time.sleep(2)
-                    if get_icecast_status():
-                        return jsonify({'success': True, 'message': 'Icecast server started successfully'})
-                    # If still not detected but we saw success messages, assume it worked
-                    # (the status check might be timing out)
-                    return jsonify({'success': True, 'message': 'Icecast server started successfully (daemon mode - parent process exited, Icecast running in background)'})
+                # If still not detected but we saw success messages, assume it worked
+                # (the parent process exiting is normal for daemon mode)
+                return jsonify({'success': True, 'message': 'Icecast server started successfully (daemon mode - parent process exited, Icecast running in background)'})
             
             # If no success messages, check for actual errors
             if error_msg:
@@ -1865,14 +2755,12 @@ def api_icecast_start():
                     return jsonify({'success': False, 'message': f'Failed to start Icecast: {error_msg[:200]}'})
             else:
                 # No error message, do final status check
-                time.sleep(1)
-                if get_icecast_status():
+                if _wait_icecast_up(1.0):
                     return jsonify({'success': True, 'message': 'Icecast server started successfully'})
                 return jsonify({'success': False, 'message': 'Failed to start Icecast. Check system logs.'})
         except Exception as read_error:
             # Error reading output, but check status anyway
-            time.sleep(1)
-            if get_icecast_status():
+            if _wait_icecast_up(1.0):
                 return jsonify({'success': True, 'message': 'Icecast server started successfully'})
             return jsonify({'success': False, 'message': f'Failed to start Icecast. Error reading output: {str(read_error)}'})
     except Exception as e:
@@ -1882,74 +2770,29 @@ def api_icecast_start():
 @login_required
 def api_icecast_stop():
     """Stop Icecast server"""
-    if not get_icecast_status():
+    if not get_icecast_status(fresh=True):
         return jsonify({'success': False, 'message': 'Icecast is not running'})
     
     try:
-        # Try using systemctl first (preferred method)
-        systemctl_path = shutil.which('systemctl') or '/usr/bin/systemctl'
-        try:
-            result = subprocess.run([systemctl_path, 'stop', 'icecast2'],
-                                  capture_output=True, text=True, timeout=5)
-            time.sleep(2)
-            if not get_icecast_status():
-                return jsonify({'success': True, 'message': 'Icecast server stopped successfully'})
-        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-            # Continue to fallback methods
-            pass
-        
-        # Fallback 1: Use pkill with pattern matching (more reliable than -x)
-        # Try with sudo first (in case process is owned by icecast2 user)
-        pkill_path = shutil.which('pkill') or '/usr/bin/pkill'
-        sudo_path = shutil.which('sudo') or '/usr/bin/sudo'
-        try:
-            # Try with sudo first
-            subprocess.run([sudo_path, pkill_path, '-f', 'icecast2'], check=False, timeout=3)
-            time.sleep(2)
-            if not get_icecast_status():
-                return jsonify({'success': True, 'message': 'Icecast server stopped successfully'})
-        except:
-            pass
-        
-        # Fallback 2: Try without sudo
-        try:
-            subprocess.run([pkill_path, '-f', 'icecast2'], check=False, timeout=3)
-            time.sleep(2)
-            if not get_icecast_status():
-                return jsonify({'success': True, 'message': 'Icecast server stopped successfully'})
-        except:
-            pass
-        
-        # Fallback 3: Use pkill with exact name (with sudo)
-        try:
-            subprocess.run([sudo_path, pkill_path, '-x', 'icecast2'], check=False, timeout=3)
-            time.sleep(2)
-            if not get_icecast_status():
-                return jsonify({'success': True, 'message': 'Icecast server stopped successfully'})
-        except:
-            pass
-        
-        # Fallback 4: Use pkill with signal 9 (KILL) - more aggressive (with sudo)
-        try:
-            subprocess.run([sudo_path, pkill_path, '-9', '-f', 'icecast2'], check=False, timeout=3)
-            time.sleep(1)
-            if not get_icecast_status():
-                return jsonify({'success': True, 'message': 'Icecast server stopped successfully (force kill)'})
-        except:
-            pass
+        # Try using systemctl first (preferred method); `stop` returns once the unit is down
+        _run_quiet(_SYSTEMCTL_STOP_ICECAST, timeout=5.0)
+        if not get_icecast_status(fresh=True):
+            return jsonify({'success': True, 'message': 'Icecast server stopped successfully'})
         
-        # Fallback 5: Try killall as last resort (with sudo)
-        killall_path = shutil.which('killall') or '/usr/bin/killall'
-        try:
-            subprocess.run([sudo_path, killall_path, '-9', 'icecast2'], check=False, timeout=3)
-            time.sleep(1)
-            if not get_icecast_status():
-                return jsonify({'success': True, 'message': 'Icecast server stopped successfully (killall)'})
-        except:
-            pass
+        # Fallback: signal the pids from the /proc scan directly, escalating to SIGKILL only if
+        # it stays up. When we may not signal them (icecast runs as the icecast2 user), one pkill
+        # by exact process name via sudo - -x rather than -f so the pattern can't match the sudo
+        # process's own command line.
+        for sig, argvs, grace, message in _ICECAST_STOP_ROUNDS:
+            pids = [pid for pid, _ in _find_procs({'icecast2'}).get('icecast2', ())]
+            if not all([_signal_pid(pid, sig) for pid in pids]):
+                _run_quiet(*argvs, timeout=3.0)
+            _wait_pids_exit(pids, grace)
+            if not get_icecast_status(fresh=True):
+                return jsonify({'success': True, 'message': message})
         
         # Final check - if still running, report failure
-        if get_icecast_status():
+        if get_icecast_status(fresh=True):
             return jsonify({
                 'success': False, 
                 'message': 'Failed to stop Icecast server. Process may be stuck. Try: sudo systemctl stop icecast2'
@@ -1962,7 +2805,7 @@ def api_icecast_stop():
 @app.route('/api/audio/levels')
 def api_audio_levels():
     """Get current audio levels"""
-    return jsonify(audio_levels)
+    return jsonify(_audio_levels_dict())
 
 
 @app.route('/api/decoder/volume', methods=['POST'])
@@ -1972,69 +2815,176 @@ def api_decoder_volume():
     # Volume is now always 100% - no user control
     return jsonify({'success': True, 'message': 'Volume is always set to maximum (100%)'})
 
+_NET_INFO_TTL = 30.0
+_NET_INFO_MISS_TTL = 1.0  # no address yet (link down / DHCP pending): look again soon
+_ROUTE_SCAN_LINES = 1000  # /proc/net/route lines read looking for the default route
+
+# rtnetlink constants (linux/netlink.h, linux/rtnetlink.h, linux/if_addr.h)
+_RTM_NEWADDR, _RTM_GETADDR = 20, 22
+_NLMSG_ERROR, _NLMSG_DONE = 2, 3
+_NLM_F_REQUEST, _NLM_F_DUMP = 0x1, 0x300
+_IFA_LOCAL, _IFA_LABEL = 2, 3
+_NLMSG_HDR = struct.Struct('=LHHLL')
+_IFADDRMSG = struct.Struct('=BBBBI')
+_RTATTR = struct.Struct('=HH')
+
+def _netlink_ipv4() -> list:
+    """One RTM_GETADDR dump over rtnetlink: [(ifname, ip, prefixlen), ...] for IPv4 addresses."""
+    out = []
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, 0) as sock:
+        sock.settimeout(1.0)
+        request = _IFADDRMSG.pack(socket.AF_INET, 0, 0, 0, 0)
+        sock.send(_NLMSG_HDR.pack(_NLMSG_HDR.size + len(request), _RTM_GETADDR,
+                                  _NLM_F_REQUEST | _NLM_F_DUMP, 1, 0) + request)
+        while True:
+            data = sock.recv(65536)
+            offset = 0
+            while offset + _NLMSG_HDR.size <= len(data):
+                msg_len, msg_type = _NLMSG_HDR.unpack_from(data, offset)[:2]
+                if msg_len < _NLMSG_HDR.size:
+                    return out
+                if msg_type == _NLMSG_DONE:
+                    return out
+                if msg_type == _NLMSG_ERROR:
+                    raise OSError('rtnetlink RTM_GETADDR failed')
+                if msg_type == _RTM_NEWADDR:
+                    body = offset + _NLMSG_HDR.size
+                    family, prefixlen = _IFADDRMSG.unpack_from(data, body)[:2]
+                    addr = label = None
+                    attr = body + _IFADDRMSG.size
+                    end = offset + msg_len
+                    while attr + _RTATTR.size <= end:
+                        attr_len, attr_type = _RTATTR.unpack_from(data, attr)
+                        if attr_len < _RTATTR.size:
+                            break
+                        value = data[attr + _RTATTR.size:attr + attr_len]
+                        if attr_type == _IFA_LOCAL:
+                            addr = socket.inet_ntoa(value)
+                        elif attr_type == _IFA_LABEL:
+                            label = value.rstrip(b'\0').decode(errors='replace')
+                        attr += (attr_len + 3) & ~3
+                    if family == socket.AF_INET and addr:
+                        out.append((label or '', addr, prefixlen))
+                offset += (msg_len + 3) & ~3
+
+def _iface_ipv4() -> list:
+    """[(ifname, ip, prefixlen), ...] for every IPv4 address; one netlink dump, `ip` only as fallback."""
+    try:
+        return _netlink_ipv4()
+    except OSError:
+        pass
+    out = []
+    try:
+        result = subprocess.run([IP_PATH, '-o', '-4', 'addr', 'show'], capture_output=True, text=True, timeout=3)
+        for line in result.stdout.splitlines():
+            # "2: eth0    inet 192.168.1.5/24 brd 192.168.1.255 scope global eth0 ..."
+            parts = line.split()
+            if len(parts) >= 4 and parts[2] == 'inet' and '/' in parts[3]:
+                addr, prefix = parts[3].split('/', 1)
+                out.append((parts[1], addr, int(prefix)))
+    except Exception:
+        pass
+    return out
+
+def _default_route() -> tuple:
+    """(interface, gateway) of the IPv4 default route, or (None, 'Unknown') if there is none."""
+    try:
+        # Stream it and stop at the default route: the table can be huge on a router, and
+        # 0.0.0.0/0 sorts first in the kernel's FIB walk, so the cap only bounds pathological cases
+        with open('/proc/net/route', 'r') as f:
+            next(f, None)  # Skip header
+            for _, line in zip(range(_ROUTE_SCAN_LINES), f):
+                parts = line.split(None, 8)
+                if len(parts) >= 8 and parts[1] == '00000000':  # Default route
+                    # The kernel prints the address as a little-endian u32: reversing its
+                    # bytes gives network order for inet_ntoa
+                    return parts[0], socket.inet_ntoa(bytes.fromhex(parts[2])[::-1])
+    except (OSError, ValueError):
+        pass
+    return None, 'Unknown'
+
+INTERFACES_FILE = Path('/etc/network/interfaces')
+# (st_mtime_ns, mentions 'static', content) of the last read; re-read only when the file changes
+_interfaces_cache = (None, False, '')
+
+def _iface_config_type(ip: str) -> str:
+    """'static' if /etc/network/interfaces configures `ip` statically, else 'dhcp'."""
+    global _interfaces_cache
+    try:
+        mtime = INTERFACES_FILE.stat().st_mtime_ns
+    except OSError:
+        return 'dhcp'
+    cached_mtime, has_static, content = _interfaces_cache
+    if mtime != cached_mtime:
+        try:
+            content = INTERFACES_FILE.read_text()
+        except OSError:
+            return 'dhcp'
+        has_static = 'static' in content.lower()
+        _interfaces_cache = (mtime, has_static, content)
+    return 'static' if has_static and ip in content else 'dhcp'
+
+@_ttl_cache(_NET_INFO_TTL, miss_ttl=_NET_INFO_MISS_TTL, is_miss=lambda info: info['ip'] == 'Unknown')
+def _collect_network_info() -> dict:
+    """
+    Current {'ip', 'netmask', 'gateway', 'type'}; ip is 'Unknown' if it can't be detected.
+    Cached for _NET_INFO_TTL seconds, and the interface addresses come from a single dump.
+    """
+    # Default route first: one streamed /proc/net/route scan gives both the gateway and the
+    # interface whose address is "the" LAN IP (not e.g. a docker bridge listed earlier)
+    default_iface, gateway = _default_route()
+    
+    # Address on the default-route interface, else the first non-loopback one. No
+    # gethostbyname(gethostname()): that goes through the resolver (hosts/mDNS), can block,
+    # and on a Pi usually just answers 127.0.1.1
+    ip = 'Unknown'
+    netmask = '255.255.255.0'  # Default
+    addrs = sorted((entry for entry in _iface_ipv4() if not entry[1].startswith('127.')),
+                   key=lambda entry: entry[0] != default_iface)  # stable: keeps kernel order otherwise
+    if addrs:
+        _, ip, prefixlen = addrs[0]
+        # Netmask from the prefix length of the address we found
+        netmask = cidr_to_netmask(prefixlen)
+    
+    # Determine if DHCP or static (check /etc/network/interfaces or systemd-networkd)
+    config_type = _iface_config_type(ip)
+    
+    return {
+        'ip': ip,
+        'netmask': netmask,
+        'gateway': gateway,
+        'type': config_type
+    }
+
+# (network info dict the tag was computed for, its ETag): hashed once per cache refresh
+_net_info_etag = (None, '')
+
+def _network_info_etag(info: dict) -> str:
+    """ETag for a _collect_network_info() result; recomputed only when the cached dict changes."""
+    global _net_info_etag
+    cached_info, etag = _net_info_etag
+    if cached_info is not info:
+        etag = hashlib.md5(json.dumps(info, sort_keys=True).encode()).hexdigest()
+        _net_info_etag = (info, etag)
+    return etag
+
+def _conditional_json(payload: dict, etag: str):
+    """jsonify(payload) with an ETag, or an empty 304 if the client already has this version."""
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(payload)
+    response.set_etag(etag)
+    return response
+
 @app.route('/api/settings/ip')
 def api_get_ip():
     """Get current IP address"""
     try:
-        import socket
-        import re
-        
-        # Method 1: Try using socket to get hostname and then resolve
-        try:
-            hostname = socket.gethostname()
-            ip = socket.gethostbyname(hostname)
-            # If it's localhost, try to get actual interface IP
-            if ip.startswith('127.'):
-                # Method 2: Try reading from /proc/net/route or using ip command
-                ip_path = shutil.which('ip') or '/usr/bin/ip'
-                result = subprocess.run([ip_path, 'addr', 'show'], capture_output=True, text=True, timeout=3)
-                if result.returncode == 0:
-                    # Find first non-loopback IPv4 address
-                    matches = re.findall(r'inet (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                    for match in matches:
-                        if not match.startswith('127.'):
-                            ip = match
-                            break
-        except:
-            ip = 'Unknown'
-        
-        # Method 3: Fallback - try hostname command with full path
-        if ip == 'Unknown' or ip.startswith('127.'):
-            hostname_path = shutil.which('hostname') or '/usr/bin/hostname'
-            try:
-                result = subprocess.run([hostname_path, '-I'], capture_output=True, text=True, timeout=2)
-                if result.returncode == 0 and result.stdout.strip():
-                    ips = result.stdout.strip().split()
-                    for candidate_ip in ips:
-                        if not candidate_ip.startswith('127.') and '.' in candidate_ip:
-                            ip = candidate_ip
-                            break
-            except:
-                pass
-        
-        # Method 4: Try reading from network interfaces directly
-        if ip == 'Unknown' or ip.startswith('127.'):
-            try:
-                # Read from /proc/net/route to find default interface, then get its IP
-                with open('/proc/net/route', 'r') as f:
-                    lines = f.readlines()
-                    for line in lines[1:]:  # Skip header
-                        parts = line.split()
-                        if len(parts) >= 8 and parts[1] == '00000000':  # Default route
-                            interface = parts[0]
-                            # Get IP for this interface
-                            ip_path = shutil.which('ip') or '/usr/bin/ip'
-                            result = subprocess.run([ip_path, 'addr', 'show', interface], 
-                                                  capture_output=True, text=True, timeout=2)
-                            if result.returncode == 0:
-                                match = re.search(r'inet (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                                if match and not match.group(1).startswith('127.'):
-                                    ip = match.group(1)
-                                    break
-            except:
-                pass
-        
-        return jsonify({'ip': ip if ip != 'Unknown' else 'Unable to detect IP'})
+        info = _collect_network_info()
+        ip = info['ip']
+        return _conditional_json({'ip': ip if ip != 'Unknown' else 'Unable to detect IP'},
+                                 'ip-' + _network_info_etag(info))
     except Exception as e:
         return jsonify({'ip': f'Error: {str(e)}'}), 500
 
@@ -2042,79 +2992,8 @@ def api_get_ip():
 def api_get_network():
     """Get current network configuration"""
     try:
-        import socket
-        import re
-        
-        # Get IP address
-        ip = 'Unknown'
-        try:
-            hostname = socket.gethostname()
-            ip = socket.gethostbyname(hostname)
-            if ip.startswith('127.'):
-                ip_path = shutil.which('ip') or '/usr/bin/ip'
-                result = subprocess.run([ip_path, 'addr', 'show'], capture_output=True, text=True, timeout=3)
-                if result.returncode == 0:
-                    matches = re.findall(r'inet (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                    for match in matches:
-                        if not match.startswith('127.'):
-                            ip = match
-                            break
-        except:
-            pass
-        
-        # Get netmask
-        netmask = '255.255.255.0'  # Default
-        try:
-            ip_path = shutil.which('ip') or '/usr/bin/ip'
-            result = subprocess.run([ip_path, 'addr', 'show'], capture_output=True, text=True, timeout=3)
-            if result.returncode == 0:
-                # Find netmask for the IP we found
-                lines = result.stdout.split('\n')
-                for i, line in enumerate(lines):
-                    if ip in line and 'inet' in line:
-                        # Next line might have netmask, or it's in CIDR notation
-                        if '/' in line:
-                            cidr = line.split('/')[1].split()[0]
-                            # Convert CIDR to netmask
-                            cidr_int = int(cidr)
-                            netmask = cidr_to_netmask(cidr_int)
-                        break
-        except:
-            pass
-        
-        # Get gateway
-        gateway = 'Unknown'
-        try:
-            with open('/proc/net/route', 'r') as f:
-                lines = f.readlines()
-                for line in lines[1:]:
-                    parts = line.split()
-                    if len(parts) >= 8 and parts[1] == '00000000':  # Default route
-                        gateway_hex = parts[2]
-                        # Convert hex to IP
-                        gateway = '.'.join([str(int(gateway_hex[i:i+2], 16)) for i in range(6, -1, -2)])
-                        break
-        except:
-            pass
-        
-        # Determine if DHCP or static (check /etc/network/interfaces or systemd-networkd)
-        config_type = 'dhcp'  # Default
-        try:
-            # Check /etc/network/interfaces
-            if Path('/etc/network/interfaces').exists():
-                with open('/etc/network/interfaces', 'r') as f:
-                    content = f.read()
-                    if 'static' in content.lower() and ip in content:
-                        config_type = 'static'
-        except:
-            pass
-        
-        return jsonify({
-            'ip': ip,
-            'netmask': netmask,
-            'gateway': gateway,
-            'type': config_type
-        })
+        info = _collect_network_info()
+        return _conditional_json(info, _network_info_etag(info))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -2122,6 +3001,8 @@ def api_get_network():
 @login_required
 def api_save_network():
     """Save network configuration (read-only for now - shows instructions)"""
+    # The user may be about to change the address; don't serve a stale one afterwards
+    _collect_network_info.cache_clear()
     try:
         config = request.get_json()
         config_type = config.get('type', 'dhcp')
@@ -2166,87 +3047,114 @@ Then restart networking: sudo systemctl restart dhcpcd
 
 def cidr_to_netmask(cidr):
     """Convert CIDR notation to netmask"""
-    mask = (0xffffffff >> (32 - cidr)) << (32 - cidr)
-    return '.'.join([str((mask >> (8 * (3 - i))) & 0xff) for i in range(4)])
+    return socket.inet_ntoa(struct.pack('!I', (0xffffffff << (32 - cidr)) & 0xffffffff))
 
 def netmask_to_cidr(netmask):
     """Convert netmask to CIDR notation"""
-    parts = netmask.split('.')
-    binary = ''.join([format(int(part), '08b') for part in parts])
-    return str(len(binary.rstrip('0')))
+    return str(bin(struct.unpack('!I', socket.inet_aton(netmask))[0]).count('1'))
+
+def _parse_alsa_list(listing: bytes) -> list:
+    """Device entries (with sysfs USB info) for each card line of an `arecord -l`/`aplay -l` listing."""
+    devices = []
+    for line in listing.decode(errors='replace').split('\n'):
+        # Parse card line: card 1: DeviceName [Device Description], device 0: ...
+        if not line.startswith('card '):
+            continue
+        head, _, tail = line.partition(':')
+        card_num = head[5:].strip()
+        if card_num:
+            # Description runs up to the next ':' ("..., device 0"); the name up to the '['
+            device_info = tail.partition(':')[0].strip()
+            name_end = device_info.find('[')
+            device_name = device_info[:name_end].strip() if name_end >= 0 else device_info
+            
+            # Get USB info from sysfs
+            usb_info = get_usb_device_info(card_num)
+            
+            devices.append({
+                'card': card_num,
+                'name': device_name,
+                'alsa_id': f'hw:{card_num},0',
+                'bus': usb_info.get('bus', ''),
+                'vendor': usb_info.get('vendor', ''),
+                'product': usb_info.get('product', ''),
+                'description': device_info
+            })
+    return devices
 
 @app.route('/api/settings/audio-devices')
 def api_detect_audio_devices():
     """Detect audio devices with detailed USB information"""
     try:
-        input_devices = []
-        output_devices = []
-        
-        # Get input devices using arecord
-        arecord_path = shutil.which('arecord') or '/usr/bin/arecord'
-        result = subprocess.run([arecord_path, '-l'], capture_output=True, text=True, timeout=5)
-        
-        if result.returncode == 0:
-            lines = result.stdout.split('\n')
-            current_card = None
-            for line in lines:
-                if 'card' in line.lower():
-                    # Parse card line: card 1: DeviceName [Device Description], device 0: ...
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        card_num = parts[0].split()[-1] if 'card' in parts[0].lower() else None
-                        if card_num:
-                            device_info = parts[1].strip()
-                            device_name = device_info.split('[')[0].strip() if '[' in device_info else device_info
-                            
-                            # Get USB info from sysfs
-                            usb_info = get_usb_device_info(card_num)
-                            
-                            input_devices.append({
-                                'card': card_num,
-                                'name': device_name,
-                                'alsa_id': f'hw:{card_num},0',
-                                'bus': usb_info.get('bus', ''),
-                                'vendor': usb_info.get('vendor', ''),
-                                'product': usb_info.get('product', ''),
-                                'description': device_info
-                            })
-        
-        # Get output devices using aplay
-        aplay_path = shutil.which('aplay') or '/usr/bin/aplay'
-        result = subprocess.run([aplay_path, '-l'], capture_output=True, text=True, timeout=5)
-        
-        if result.returncode == 0:
-            lines = result.stdout.split('\n')
-            for line in lines:
-                if 'card' in line.lower():
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        card_num = parts[0].split()[-1] if 'card' in parts[0].lower() else None
-                        if card_num:
-                            device_info = parts[1].strip()
-                            device_name = device_info.split('[')[0].strip() if '[' in device_info else device_info
-                            
-                            # Get USB info from sysfs
-                            usb_info = get_usb_device_info(card_num)
-                            
-                            output_devices.append({
-                                'card': card_num,
-                                'name': device_name,
-                                'alsa_id': f'hw:{card_num},0',
-                                'bus': usb_info.get('bus', ''),
-                                'vendor': usb_info.get('vendor', ''),
-                                'product': usb_info.get('product', ''),
-                                'description': device_info
-                            })
-        
-        return jsonify({
-            'input': input_devices,
-            'output': output_devices
-        })
+        return jsonify(_detected_audio_devices(_alsa_cards_key()))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+_detected_devices_cache = (None, None)  # (listings it was parsed from, device table)
+
+def _detected_audio_devices(cards_key: bytes) -> dict:
+    """Parsed device table for one card set (rebuilt only on hotplug; treat as read-only)."""
+    global _detected_devices_cache
+    # Both listings come from one concurrent, card-set-keyed arecord/aplay run
+    listings = _alsa_device_lists(cards_key)
+    parsed_from, devices = _detected_devices_cache
+    if parsed_from is listings:
+        return devices
+    capture_listing, playback_listing = listings
+    devices = {
+        'input': _parse_alsa_list(capture_listing),
+        'output': _parse_alsa_list(playback_listing)
+    }
+    # Only a cached (complete) listing comes back as the same object, so failed runs are reparsed
+    _detected_devices_cache = (listings, devices)
+    return devices
+
+_ICECAST_PASSWORD_TAGS = frozenset(('admin-password', 'source-password', 'relay-password'))
+
+class _CommentTreeBuilder(ET.TreeBuilder):
+    """TreeBuilder that keeps comments as Comment elements on Python 3.7 (no insert_comments)."""
+
+    def comment(self, data):
+        self.start(ET.Comment, {})
+        self.data(data)
+        return self.end(ET.Comment)
+
+def _comment_tree_builder():
+    """A TreeBuilder that keeps comments: insert_comments on 3.8+, the subclass on 3.7."""
+    try:
+        return ET.TreeBuilder(insert_comments=True)
+    except TypeError:
+        return _CommentTreeBuilder()
+
+def _set_icecast_passwords(config_text: str, new_password: str):
+    """
+    Return icecast.xml text with the admin/source/relay passwords and every <mount> password
+    set to new_password, or None if they all already are. One ElementTree parse and walk;
+    comments are kept (so commented-out example mounts stay untouched), as is anything
+    around the root element.
+    """
+    parser = ET.XMLParser(target=_comment_tree_builder())
+    root = ET.fromstring(config_text, parser=parser)
+    changed = False
+    for elem in root.iter():
+        if elem.tag in _ICECAST_PASSWORD_TAGS:
+            targets = (elem,)
+        elif elem.tag == 'mount':
+            targets = elem.iter('password')
+        else:
+            continue
+        for target in targets:
+            if target.text != new_password:
+                target.text = new_password
+                changed = True
+    if not changed:
+        return None
+    prologue = config_text[:config_text.find(f'<{root.tag}')]
+    closing = f'</{root.tag}>'
+    end = config_text.rfind(closing)
+    epilogue = config_text[end + len(closing):] if end >= 0 else '\n'
+    return prologue + ET.tostring(root, encoding='unicode') + epilogue
+
 @app.route('/api/settings/change-password', methods=['POST'])
 @login_required
 def api_change_password():
@@ -2266,20 +3174,12 @@ def api_change_password():
             return jsonify({'success': False, 'message': 'Password must be at least 4 characters long'}), 400
         
         # Verify current password
-        current_hash = hashlib.sha256(current_password.encode()).hexdigest()
-        stored_hash = load_password_hash()
-        
-        if current_hash != stored_hash:
+        if not _verify_password(current_password, ADMIN_PASSWORD_HASH):
             return jsonify({'success': False, 'message': 'Current password is incorrect'}), 401
         
-        # Update password hash
-        new_hash = hashlib.sha256(new_password.encode()).hexdigest()
+        # Update password hash (the cached copy too, so the next login sees the new password)
         try:
-            with open(PASSWORD_FILE, 'w') as f:
-                f.write(new_hash)
-            # Update global variable
-            global ADMIN_PASSWORD_HASH
-            ADMIN_PASSWORD_HASH = new_hash
+            _store_password_hash(_hash_password(new_password))
         except Exception as e:
             return jsonify({'success': False, 'message': f'Failed to save password: {str(e)}'}), 500
         
@@ -2288,55 +3188,36 @@ def api_change_password():
         if not icecast_config_path.exists():
             icecast_config_path = Path(__file__).parent / 'icecast.xml'
         
+        message = 'Password changed for the UI; no Icecast config was found'
         if icecast_config_path.exists():
             try:
                 # Read current config
                 with open(icecast_config_path, 'r') as f:
                     icecast_config = f.read()
                 
-                # Update all password fields in Icecast config
-                # Update admin-password
-                import re
-                icecast_config = re.sub(
-                    r'(<admin-password>)(.*?)(</admin-password>)',
-                    r'\1' + new_password + r'\3',
-                    icecast_config
-                )
-                # Update source-password
-                icecast_config = re.sub(
-                    r'(<source-password>)(.*?)(</source-password>)',
-                    r'\1' + new_password + r'\3',
-                    icecast_config
-                )
-                # Update relay-password
-                icecast_config = re.sub(
-                    r'(<relay-password>)(.*?)(</relay-password>)',
-                    r'\1' + new_password + r'\3',
-                    icecast_config
-                )
-                # Update mount password (within <mount> section)
-                # This is more specific to avoid matching other password tags
-                icecast_config = re.sub(
-                    r'(<mount>.*?<password>)(.*?)(</password>.*?</mount>)',
-                    lambda m: m.group(1) + new_password + m.group(3),
-                    icecast_config,
-                    flags=re.DOTALL
-                )
+                # Update all password fields in Icecast config in one parse
+                icecast_config = _set_icecast_passwords(icecast_config, new_password)
                 
-                # Write updated config
-                with open(icecast_config_path, 'w') as f:
-                    f.write(icecast_config)
+                # Write updated config (nothing to write or restart if it already had this password)
+                if icecast_config is not None:
+                    with open(icecast_config_path, 'w') as f:
+                        f.write(icecast_config)
                 
-                # If Icecast is running, restart it to apply new password
-                # (Note: This requires sudo, so we'll just inform the user)
-                icecast_running = get_icecast_status()
+                # If Icecast is running and its config changed, have it reload the new password
+                if icecast_config is None:
+                    message = 'Password changed for the UI; Icecast already used it, so nothing was reloaded'
+                else:
+                    message = 'Password changed for both UI and Icecast server; Icecast uses it from its next start'
+                icecast_running = icecast_config is not None and get_icecast_status(fresh=True)
                 if icecast_running:
-                    # Try to restart Icecast (may require sudo)
-                    try:
-                        subprocess.run(['sudo', 'systemctl', 'restart', 'icecast2'], 
-                                      timeout=5, capture_output=True)
-                    except:
-                        pass  # If restart fails, user can do it manually
+                    message = 'Password changed for both UI and Icecast server; Icecast was sent a config reload'
+                    # Icecast re-reads its config on SIGHUP: a signal instead of a full service
+                    # restart (which drops every listener and source), and it also reaches an
+                    # icecast we started outside systemd. Sent (via sudo, as icecast runs as the
+                    # icecast2 user) off the request thread; if it fails, user can restart manually
+                    threading.Thread(target=_run_quiet,
+                                     args=((SUDO_PATH, '-n', PKILL_PATH, '-HUP', '-x', 'icecast2'),),
+                                     daemon=True).start()
                 
             except Exception as e:
                 return jsonify({
@@ -2344,50 +3225,58 @@ def api_change_password():
                     'message': f'Password updated for UI, but failed to update Icecast config: {str(e)}'
                 }), 500
         
-        return jsonify({
-            'success': True, 
-            'message': 'Password changed successfully for both UI and Icecast server. Please restart Icecast if it is running.'
-        })
+        return jsonify({'success': True, 'message': message})
         
     except Exception as e:
-        import traceback
         return jsonify({'success': False, 'message': f'Error: {str(e)}', 'trace': traceback.format_exc()[:200]}), 500
 
+def _warm_caches():
+    """Populate the network info and ALSA listing caches (best effort)."""
+    for warm in (_collect_network_info, alsa_device_lists):
+        try:
+            warm()
+        except Exception:
+            pass
+
 def get_usb_device_info(card_num):
-    """Get USB device information for an audio card"""
+    """Get USB device information for an audio card (cached until the card set changes)"""
+    return _usb_device_info(str(card_num), _alsa_cards_key())
+
+@lru_cache(maxsize=32)
+def _usb_device_info(card_num: str, cards_key: bytes) -> dict:
+    """sysfs/procfs lookup behind get_usb_device_info; cards_key only keys the cache."""
     usb_info = {}
+    # Try to find USB device info in /proc/asound/cardX: open it directly (EAFP) rather than
+    # stat-ing the card directory and the file first
     try:
-        # Try to find USB device info in /proc/asound/cardX
-        card_path = Path(f'/proc/asound/card{card_num}')
-        if card_path.exists():
-            # Look for usbid file
-            usbid_file = card_path / 'usbid'
-            if usbid_file.exists():
-                with open(usbid_file, 'r') as f:
-                    usb_id = f.read().strip()
-                    if usb_id:
-                        usb_info['bus'] = 'USB'
-                        # Try to get vendor/product from /sys/bus/usb/devices
-                        # This is a simplified version - full implementation would parse USB IDs
-                        usb_info['vendor'] = 'USB Device'
-                        usb_info['product'] = usb_id
-        else:
-            # Try alternative method: check if card is USB by checking /sys/class/sound
-            sound_path = Path(f'/sys/class/sound/card{card_num}')
-            if sound_path.exists():
-                device_path = sound_path / 'device'
-                if device_path.exists() and device_path.is_symlink():
-                    real_path = device_path.resolve()
-                    if 'usb' in str(real_path).lower():
-                        usb_info['bus'] = 'USB'
-                        # Try to extract vendor/product from path
-                        parts = str(real_path).split('/')
-                        for part in parts:
-                            if ':' in part and len(part.split(':')) >= 2:
-                                vid_pid = part.split(':')
-                                if len(vid_pid) >= 2:
-                                    usb_info['vendor'] = f'Vendor ID: {vid_pid[0]}'
-                                    usb_info['product'] = f'Product ID: {vid_pid[1]}'
+        usb_id = Path(f'/proc/asound/card{card_num}/usbid').read_text().strip()
+        if usb_id:
+            usb_info['bus'] = 'USB'
+            # Try to get vendor/product from /sys/bus/usb/devices
+            # This is a simplified version - full implementation would parse USB IDs
+            usb_info['vendor'] = 'USB Device'
+            usb_info['product'] = usb_id
+        return usb_info
+    except FileNotFoundError:
+        # No usbid: either not a USB card, or no such card in procfs
+        if os.path.isdir(f'/proc/asound/card{card_num}'):
+            return usb_info
+    except Exception:
+        return usb_info
+    try:
+        # Try alternative method: check if card is USB by checking /sys/class/sound
+        device_link = f'/sys/class/sound/card{card_num}/device'
+        os.readlink(device_link)  # Raises unless it exists and is a symlink
+        real_path = os.path.realpath(device_link)
+        if 'usb' in real_path.lower():
+            usb_info['bus'] = 'USB'
+            # Try to extract vendor/product from path
+            for part in real_path.split('/'):
+                if ':' in part and len(part.split(':')) >= 2:
+                    vid_pid = part.split(':')
+                    if len(vid_pid) >= 2:
+                        usb_info['vendor'] = f'Vendor ID: {vid_pid[0]}'
+                        usb_info['product'] = f'Product ID: {vid_pid[1]}'
     except Exception:
         pass
     
@@ -2416,5 +3305,9 @@ if __name__ == '__main__':
     decoder_supervisor_thread = threading.Thread(target=_decoder_supervisor_loop, daemon=True)
     decoder_supervisor_thread.start()
     
+    # Warm the network and ALSA caches in the background so the first settings page load
+    # doesn't pay for the probes; afterwards they refresh on TTL / card hotplug
+    threading.Thread(target=_warm_caches, daemon=True).start()
+    
     app.run(host='0.0.0.0', port=5000, debug=False)
 
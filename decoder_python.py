@@ -9,6 +9,8 @@ import argparse
 import subprocess
 import signal
 import time
+import queue
+import threading
 
 def check_dependencies():
     """Check if required Python packages are available"""
@@ -43,10 +45,40 @@ def play_stream_python(url):
     except ImportError:
         return False
     
-    CHUNK = 1024
+    CHUNK = 1024  # frames per device buffer / per ring slot
     FORMAT = pyaudio.paInt16
     CHANNELS = 2
     RATE = 44100
+    FRAME_BYTES = CHANNELS * 2
+    RING_CHUNKS = 64  # ~1.5 s of audio between the network and the device
+    
+    # Network reads fill the ring; PortAudio's callback drains it on its own thread, so a
+    # network stall eats into the ring (then plays silence) instead of blocking the device
+    # A None in the ring marks the end of the stream
+    ring = queue.Queue(maxsize=RING_CHUNKS)
+    pending = bytearray()
+    eos = threading.Event()  # callback has taken the end marker off the ring
+    drained = threading.Event()  # callback has handed the last of the audio to the device
+    
+    def callback(in_data, frame_count, time_info, status):
+        need = frame_count * FRAME_BYTES
+        while len(pending) < need and not eos.is_set():
+            try:
+                chunk = ring.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                eos.set()
+            else:
+                pending.extend(chunk)
+        if eos.is_set() and len(pending) <= need:
+            drained.set()
+        if len(pending) < need:
+            # Underrun (or end of stream): pad with silence and keep the stream running
+            pending.extend(bytes(need - len(pending)))
+        out = bytes(pending[:need])
+        del pending[:need]
+        return out, pyaudio.paContinue
     
     # Initialize PyAudio
     p = pyaudio.PyAudio()
@@ -56,7 +88,8 @@ def play_stream_python(url):
                     channels=CHANNELS,
                     rate=RATE,
                     output=True,
-                    frames_per_buffer=CHUNK)
+                    frames_per_buffer=CHUNK,
+                    stream_callback=callback)
     
     print(f"Connecting to: {url}")
     print("Press Ctrl+C to stop")
@@ -66,9 +99,28 @@ def play_stream_python(url):
         response = requests.get(url, stream=True, timeout=5)
         response.raise_for_status()
         
-        for chunk in response.iter_content(chunk_size=CHUNK):
-            if chunk:
-                stream.write(chunk)
+        # Read straight from the socket into one reused buffer (no per-chunk bytes from
+        # iter_content) and hand full CHUNK-frame slots to the ring; put() blocks when the
+        # ring is full, which paces the download to playback speed
+        buf = bytearray(CHUNK * FRAME_BYTES)
+        view = memoryview(buf)
+        filled = 0
+        while True:
+            n = response.raw.readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+            if filled == len(buf):
+                ring.put(bytes(buf))
+                filled = 0
+        whole = filled - filled % FRAME_BYTES
+        if whole:
+            ring.put(bytes(view[:whole]))
+        ring.put(None)
+        # Stream ended: wait until the callback has emptied both the ring and its pending
+        # bytes; stop_stream() below then lets the device finish the buffers it holds
+        while not drained.is_set() and stream.is_active():
+            time.sleep(0.05)
                 
     except KeyboardInterrupt:
         print("\nPlayback stopped by user")
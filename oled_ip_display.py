@@ -8,10 +8,14 @@ from __future__ import annotations
 
 import os
 
+import signal
+
 import socket
 
 import subprocess
 
+import threading
+
 import time
 
 from datetime import datetime
@@ -92,11 +96,31 @@ OLED_I2C_ADDR = env_int("OLED_I2C_ADDR", "0x3C")
 
 REFRESH_SECONDS = env_int("OLED_REFRESH_SECS", "5")
 
+IP_CACHE_SECONDS = env_int("OLED_IP_CACHE_SECS", "60")
 
 
 
 
-def get_ip_address() -> str:
+
+def _probe_ip_address() -> str:
+
+    # Connecting a UDP socket sends nothing; it just picks the default-route source address
+
+    try:
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+
+            sock.connect(("8.8.8.8", 80))
+
+            ip_addr = sock.getsockname()[0]
+
+        if not ip_addr.startswith("127."):
+
+            return ip_addr
+
+    except OSError:
+
+        pass
 
     try:
 
@@ -114,21 +138,37 @@ def get_ip_address() -> str:
 
         pass
 
-    try:
+    return "?"
+
+
+
+
+
+_ip_cache = (0.0, "?")  # (monotonic time checked, address)
+
+
+
 
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
-        sock.connect(("8.8.8.8", 80))
+def get_ip_address() -> str:
+
+    """Current IP, re-probed at most every IP_CACHE_SECONDS ("?" is retried every refresh)."""
+
+    global _ip_cache
 
-        ip_addr = sock.getsockname()[0]
+    now = time.monotonic()
 
-        sock.close()
+    checked, ip_addr = _ip_cache
+
+    if ip_addr != "?" and now - checked < IP_CACHE_SECONDS:
 
         return ip_addr
 
-    except Exception:
+    ip_addr = _probe_ip_address()
+
+    _ip_cache = (now, ip_addr)
 
-        return "?"
+    return ip_addr
 
 
 
@@ -152,10 +192,22 @@ class SSD1312Display:
 
         self.device.contrast(0x7F)
 
+        self._last = None  # (hostname, ip, HH:MM) currently on the panel
+
 
 
     def update(self, hostname: str, ip_addr: str, timestamp: str) -> None:
 
+        # Minute resolution, so most refreshes are identical and skip the I2C frame push
+
+        key = (hostname, ip_addr, timestamp[:5])
+
+        if key == self._last:
+
+            return
+
+        self._last = key
+
         with canvas(self.device) as draw:
 
             draw.text((0, 0), "PCM5102A Decoder", fill="white")
@@ -164,7 +216,7 @@ class SSD1312Display:
 
             draw.text((0, 28), f"IP: {ip_addr}", fill="white")
 
-            draw.text((0, 44), f"Time {timestamp}", fill="white")
+            draw.text((0, 44), f"Time {timestamp[:5]}", fill="white")
 
 
 
@@ -258,13 +310,31 @@ class SH1107Display:
 
         self.display.root_group = self.group
 
+        self._last = None  # (ip, status text) currently on the panel
+
+        self._host = None
+
+        self._status_prefix = ""  # hostname[:5] + " ", rebuilt only if the hostname changes
+
 
 
     def update(self, hostname: str, ip_addr: str, timestamp: str) -> None:
 
-        self.ip_big.text = ip_addr[:10]
+        if hostname != self._host:
+
+            self._host = hostname
+
+            self._status_prefix = hostname[:5] + " "
+
+        key = (ip_addr[:10], self._status_prefix + timestamp[:5])
 
-        self.status.text = f"{hostname[:5]} {timestamp[:5]}"
+        if key == self._last:
+
+            return  # Label writes mark the group dirty and trigger a refresh; skip unchanged frames
+
+        self._last = key
+
+        self.ip_big.text, self.status.text = key
 
 
 
@@ -296,9 +366,15 @@ def main() -> None:
 
     hostname = socket.gethostname()
 
+    # SIGTERM (systemctl stop) ends the refresh wait at once and still runs cleanup below
+
+    stop = threading.Event()
+
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
     try:
 
-        while True:
+        while not stop.is_set():
 
             ip_addr = get_ip_address()
 
@@ -306,7 +382,7 @@ def main() -> None:
 
             backend.update(hostname, ip_addr, now)  # type: ignore[attr-defined]
 
-            time.sleep(REFRESH_SECONDS)
+            stop.wait(REFRESH_SECONDS)
 
     except KeyboardInterrupt:
 